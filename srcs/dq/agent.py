@@ -1,14 +1,22 @@
-from openai import OpenAI
 import os
+from llm_client import run_sync
+from resources import get_llm_client
 
 # Load API key for the Featherless endpoint from environment variables
 API_KEY = os.getenv("META_API_KEY")
 
-# Initialize OpenAI-compatible client for the Featherless API
-client = OpenAI(
-    base_url="https://api.featherless.ai/v1",
-    api_key=API_KEY,
-)
+# OpenAI-compatible Featherless API endpoint
+BASE_URL = "https://api.featherless.ai/v1"
+MODEL = 'meta-llama/Llama-3.3-70B-Instruct'
+
+# Client limits, overridable through environment variables
+LLM_LIMITS = {
+    "max_concurrency": int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+    "rate_per_second": float(os.getenv("LLM_RATE_PER_SECOND", "4")),
+    "burst": int(os.getenv("LLM_BURST", "8")),
+    "timeout": float(os.getenv("LLM_TIMEOUT", "120")),
+    "max_retries": int(os.getenv("LLM_MAX_RETRIES", "5")),
+}
 
 # System prompt template for the analytical education-policy assistant
 prompt = """
@@ -30,10 +38,13 @@ prompt = """
 """
 
 
-def call_agent(prompt: str, text: str) -> str:
+async def call_agent_async(prompt: str, text: str) -> str:
     """
     Send text to the Llama-3.3-70B model using the Featherless API and return its response.
 
+    Requests share the concurrency limit, rate limit, timeout and retry
+    policy configured in `LLM_LIMITS`.
+
     Parameters
     ----------
     prompt : str
@@ -47,14 +58,31 @@ def call_agent(prompt: str, text: str) -> str:
         The model-generated summary or analytical output.
     """
     # Send the system and user messages to the model deterministically
-    response = client.chat.completions.create(
-        model='meta-llama/Llama-3.3-70B-Instruct',
-        messages=[
+    client = get_llm_client(BASE_URL, API_KEY, **LLM_LIMITS)
+    return await client.complete(
+        MODEL,
+        [
             {"role": "system", "content": prompt},
             {"role": "user", "content": text}
         ],
         temperature=0
     )
 
-    # Extract and return the model's output text
-    return response.choices[0].message.content
+
+def call_agent(prompt: str, text: str) -> str:
+    """
+    Synchronous wrapper around `call_agent_async` for existing callers.
+
+    Parameters
+    ----------
+    prompt : str
+        System prompt defining the behavior and constraints of the model.
+    text : str
+        User-provided text to be analyzed.
+
+    Returns
+    -------
+    str
+        The model-generated summary or analytical output.
+    """
+    return run_sync(call_agent_async(prompt, text))
@@ -0,0 +1,80 @@
+"""
+Bulk catalog loading benchmark.
+
+Loads the same generated catalog through `Storage.load_vectors_in_batches`
+(a PointStruct per point, wait=True per batch) and through
+`Storage.load_vectors_bulk` (contiguous array, optional gRPC, parallel
+upload, async acknowledgement plus a final barrier) and reports points per
+second for each.
+
+Run from srcs/dq:
+    python -m benchmarks.bulk_load [--points 50000] [--backend qdrant|numpy]
+                                   [--qdrant-host localhost] [--grpc] [--parallel 4]
+
+Without --qdrant-host, Qdrant runs in local in-memory mode, where transport
+and parallel upload settings have no effect.
+"""
+import argparse
+import sys
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+from storage import Storage
+
+
+def make_backend(kind: str, name: str, dim: int, root: str, host: str = None, grpc: bool = False):
+    if kind == "numpy":
+        from vector_backends.numpy_vector_backend import NumpyVectorBackend
+        return NumpyVectorBackend(name, dim, root=root)
+
+    from qdrant_client import QdrantClient
+    from vector_backends.qdrant_vector_backend import QdrantVectorBackend
+    client = QdrantClient(host=host, prefer_grpc=grpc) if host else QdrantClient(":memory:")
+    return QdrantVectorBackend(name, dim, client=client)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark bulk loading of the feature catalog.")
+    parser.add_argument("--points", type=int, default=50_000, help="Points to load")
+    parser.add_argument("--dim", type=int, default=384, help="Vector dimensionality")
+    parser.add_argument("--backend", choices=("qdrant", "numpy"), default="qdrant")
+    parser.add_argument("--qdrant-host", help="Qdrant server to load into instead of local mode")
+    parser.add_argument("--grpc", action="store_true", help="Use gRPC for the bulk path")
+    parser.add_argument("--parallel", type=int, default=1, help="Parallel uploaders for the bulk path")
+    parser.add_argument("--batch-size", type=int, default=256, help="Points per bulk request")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.points, args.dim)).astype(np.float32)
+    texts = [f"feature_{i}" for i in range(args.points)]
+
+    with tempfile.TemporaryDirectory() as root:
+        runs = {
+            "batches (wait each)": lambda storage: storage.load_vectors_in_batches(vectors, texts),
+            "bulk (wait each)": lambda storage: storage.load_vectors_bulk(
+                vectors, texts, args.batch_size, args.parallel, wait=True),
+            "bulk (async + barrier)": lambda storage: storage.load_vectors_bulk(
+                vectors, texts, args.batch_size, args.parallel, wait=False),
+        }
+        for label, load in runs.items():
+            grpc = args.grpc and label.startswith("bulk")
+            backend = make_backend(args.backend, f"bulk-{uuid.uuid4().hex[:8]}", args.dim, root,
+                                   args.qdrant_host, grpc)
+            storage = Storage(backend.collection_name, args.dim, backend=backend)
+
+            start = time.perf_counter()
+            load(storage)
+            seconds = time.perf_counter() - start
+
+            loaded = storage.my_size()
+            print(f"{label:>24}: {seconds:7.2f}s  {args.points / seconds:10.0f} points/s  visible {loaded}")
+            if loaded != args.points:
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+DOCX extraction benchmark.
+
+Generates a large transcript-like document of paragraphs and tables and
+compares the streaming DocxTextHandler with the python-docx object model:
+wall time, peak RSS (each reader in a fresh interpreter) and how many
+characters of text each one extracts.
+
+Run from srcs/dq:
+    python -m benchmarks.docx [--paragraphs 20000] [--tables 200]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+DQ_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+READERS = ("python-docx", "streaming")
+
+
+def generate_docx(path: str, paragraphs: int, tables: int, rows: int = 10) -> None:
+    """
+    Write a document alternating speaker paragraphs with small tables.
+    """
+    from docx import Document
+
+    document = Document()
+    every = max(1, paragraphs // max(tables, 1))
+    n_tables = 0
+    for i in range(paragraphs):
+        document.add_paragraph(f"Speaker {i % 5}: we discussed mentoring, school climate and item {i}.")
+        if (i + 1) % every == 0 and n_tables < tables:
+            table = document.add_table(rows=rows, cols=3)
+            for r, row in enumerate(table.rows):
+                for c, cell in enumerate(row.cells):
+                    cell.text = f"t{n_tables} r{r} c{c} answer"
+            n_tables += 1
+    document.save(path)
+
+
+def run_reader(reader: str, path: str) -> dict:
+    """
+    Extract the document with one reader and return its wall time, peak RSS and text size.
+    """
+    start = time.perf_counter()
+    if reader == "python-docx":
+        from docx import Document
+        text = "\n".join(paragraph.text for paragraph in Document(path).paragraphs)
+    else:
+        from handlers.text_handlers.docx_text_handler import DocxTextHandler
+        text = DocxTextHandler().handle(path)
+    seconds = time.perf_counter() - start
+    # ru_maxrss is in KiB on Linux
+    peak_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"reader": reader, "seconds": seconds, "peak_rss_mib": peak_mib, "chars": len(text)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark DOCX text extraction.")
+    parser.add_argument("--paragraphs", type=int, default=20_000, help="Paragraphs in the generated document")
+    parser.add_argument("--tables", type=int, default=200, help="Tables in the generated document")
+    parser.add_argument("--path", help="Benchmark an existing document instead of generating one")
+    parser.add_argument("--reader", choices=READERS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.reader:
+        print(json.dumps(run_reader(args.reader, args.path)))
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.path
+        if path is None:
+            path = os.path.join(tmp, "bench.docx")
+            generate_docx(path, args.paragraphs, args.tables)
+        print(f"Document size: {os.path.getsize(path) / 2 ** 20:.1f} MiB")
+
+        for reader in READERS:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.docx", "--reader", reader, "--path", path],
+                cwd=DQ_DIR, check=True, capture_output=True, text=True,
+            ).stdout
+            stats = json.loads(output.strip().splitlines()[-1])
+            print(f"{reader:>12}: {stats['seconds']:7.2f}s  peak RSS {stats['peak_rss_mib']:7.1f} MiB"
+                  f"  chars {stats['chars']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
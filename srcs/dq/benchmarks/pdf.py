@@ -0,0 +1,104 @@
+"""
+PDF extraction benchmark.
+
+Generates a multi-page text PDF and compares sequential extraction with
+page-parallel extraction at several worker counts: total time, time until
+the first page is available to the consumer, and whether the output matches
+the sequential text.
+
+Run from srcs/dq:
+    python -m benchmarks.pdf [--pages 400] [--lines 50] [--workers 2 4]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+
+def generate_pdf(path: str, pages: int, lines: int = 50) -> None:
+    """
+    Write a PDF of `pages` pages with `lines` lines of Helvetica text each.
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page objects are numbered
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for p in range(pages):
+        text = [b"BT /F1 10 Tf 12 TL 40 760 Td"]
+        for line in range(lines):
+            text.append(f"(Page {p + 1} line {line + 1}: school funding and learning outcomes) Tj T*".encode())
+        text.append(b"ET")
+        stream = b"\n".join(text)
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), pages)
+
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(f.tell())
+            f.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+        xref = f.tell()
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        for offset in offsets:
+            f.write(b"%010d 00000 n \n" % offset)
+        f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+
+
+def run_extraction(path: str, workers: int) -> dict:
+    """
+    Extract all pages with `workers` processes and return timings and the text.
+    """
+    from handlers.text_handlers.pdf_text_handler import PDFTextHandler
+
+    handler = PDFTextHandler(workers=workers)
+    start = time.perf_counter()
+    first_page = None
+    pages = []
+    for page in handler.iter_pages(path):
+        if first_page is None:
+            first_page = time.perf_counter() - start
+        pages.append(page)
+    return {"seconds": time.perf_counter() - start, "first_page": first_page, "text": "\n\f".join(pages)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark sequential vs page-parallel PDF extraction.")
+    parser.add_argument("--pages", type=int, default=400, help="Pages of the generated PDF")
+    parser.add_argument("--lines", type=int, default=50, help="Text lines per page")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4], help="Worker counts to compare")
+    parser.add_argument("--path", help="Benchmark an existing PDF instead of generating one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.path
+        if path is None:
+            path = os.path.join(tmp, "bench.pdf")
+            generate_pdf(path, args.pages, args.lines)
+        print(f"PDF size: {os.path.getsize(path) / 2 ** 20:.1f} MiB")
+        # The handler never runs more workers than there are CPUs
+        print(f"CPUs: {os.cpu_count()}")
+
+        baseline = run_extraction(path, workers=1)
+        print(f"{'sequential':>12}: {baseline['seconds']:7.2f}s  first page {baseline['first_page']:6.3f}s")
+        for workers in args.workers:
+            stats = run_extraction(path, workers)
+            same = "same text" if stats["text"] == baseline["text"] else "TEXT DIFFERS"
+            print(f"{f'{workers} workers':>12}: {stats['seconds']:7.2f}s  first page {stats['first_page']:6.3f}s"
+                  f"  speedup {baseline['seconds'] / stats['seconds']:4.2f}x  {same}")
+            if stats["text"] != baseline["text"]:
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
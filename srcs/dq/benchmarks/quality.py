@@ -0,0 +1,65 @@
+"""
+Data-quality engine benchmark.
+
+Cleans and checks generated messy tables of growing size and reports wall
+time, time per million rows (flat when the engine scales linearly) and the
+peak memory allocated on top of the input table.
+
+Run from srcs/dq:
+    python -m benchmarks.quality [--rows 250000 500000 1000000]
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from quality import clean_table, quality_report
+
+
+def generate_table(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Build a table of text-typed numbers, dates and categories with noise.
+    """
+    rng = np.random.default_rng(seed)
+    scores = rng.normal(70, 10, rows).round(1).astype(str)
+    scores[rng.random(rows) < 0.01] = "N/A"
+    dates = pd.Series(pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 1500, rows), unit="D"))
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "score": np.char.replace(scores, ".", ","),
+        "date": dates.dt.strftime("%d.%m.%Y").to_numpy(),
+        "answer": rng.choice(np.array(["Yes", " yes", "NO", "no ", "maybe"]), rows),
+        "hours": rng.exponential(3, rows),
+    })
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark clean_table + quality_report scaling.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[250_000, 500_000, 1_000_000])
+    parser.add_argument("--chunk-rows", type=int, default=None, help="Override DEFAULT_CHUNK_ROWS")
+    args = parser.parse_args()
+
+    kwargs = {"chunk_rows": args.chunk_rows} if args.chunk_rows else {}
+    for rows in args.rows:
+        df = generate_table(rows)
+        input_mib = df.memory_usage(deep=True).sum() / 2 ** 20
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        cleaned, cleaning = clean_table(df, **kwargs)
+        report = quality_report(cleaned, cleaning, **kwargs)
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"{rows:>9} rows: {seconds:6.2f}s  {seconds / rows * 1e6:5.2f}s/M rows"
+              f"  input {input_mib:6.1f} MiB  peak extra {peak / 2 ** 20:6.1f} MiB"
+              f"  flags {sum(len(c['flags']) for c in report['columns'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
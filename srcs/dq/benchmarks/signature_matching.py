@@ -0,0 +1,139 @@
+"""
+Column matching benchmark: names only versus names plus value signatures.
+
+Seeds a catalog with canonical English features, then resolves synthetic
+tables whose columns carry translated, abbreviated or opaque names. The LLM
+is replaced by an oracle that knows the true mapping and counts the columns
+it is asked about, so the run reports how many columns each strategy
+escalates and how many it resolves correctly.
+
+Needs the sentence-transformers model of `embedding.MODEL_NAME`.
+
+Run from srcs/dq:
+    python -m benchmarks.signature_matching [--tables 50] [--rows 300]
+"""
+import argparse
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Canonical feature -> (value generator, name variants seen in the wild)
+FEATURES = {
+    "city": (
+        lambda rng, n: rng.choice(["Praha", "Brno", "Ostrava", "Plzen", "Olomouc"], n),
+        ["mesto", "Stadt", "miasto", "town", "obec"],
+    ),
+    "math_score": (
+        lambda rng, n: rng.normal(65, 15, n).clip(0, 100).round(),
+        ["matematika_body", "Mathe Punkte", "score_m", "mat"],
+    ),
+    "physics_score": (
+        lambda rng, n: rng.normal(60, 18, n).clip(0, 100).round(),
+        ["fyzika_body", "Physik Punkte", "score_p", "fyz"],
+    ),
+    "birth_date": (
+        lambda rng, n: (pd.Timestamp("2005-01-01")
+                        + pd.to_timedelta(rng.integers(0, 2000, n), unit="D")).strftime("%Y-%m-%d"),
+        ["datum_narozeni", "Geburtsdatum", "dob", "narozen"],
+    ),
+    "gender": (
+        lambda rng, n: rng.choice(["M", "F"], n),
+        ["pohlavi", "Geschlecht", "sex", "g"],
+    ),
+    "email": (
+        lambda rng, n: np.char.add(rng.choice(["jan", "eva", "petr", "anna"], n).astype(str), "@school.cz"),
+        ["e-mail", "kontakt", "mail_addr", "E-Mail-Adresse"],
+    ),
+    "attendance_rate": (
+        lambda rng, n: rng.beta(8, 1, n).round(3),
+        ["dochazka", "Anwesenheit", "att", "presence"],
+    ),
+}
+
+
+def make_table(rng, rows):
+    """
+    Return a table of 3-5 random features under random name variants and
+    the {column: feature} truth.
+    """
+    chosen = rng.choice(list(FEATURES), rng.integers(3, 6), replace=False)
+    columns, truth = {}, {}
+    for feature in chosen:
+        generate, variants = FEATURES[feature]
+        name = str(rng.choice(variants))
+        columns[name] = generate(rng, rows)
+        truth[name] = feature
+    return pd.DataFrame(columns), truth
+
+
+def run(tables, embedder, root, hybrid, rows, seed):
+    import storage
+    from column_profile import SIGNATURE_STATS, profile_column, value_signatures
+    from vector_backends.numpy_vector_backend import NumpyVectorBackend
+
+    asked = []
+    truth = {}
+
+    def oracle(targets, catalog, candidates=None):
+        asked.extend(targets)
+        return {text: truth.get(text, "NAN") for text in targets}
+
+    storage.map_features = oracle
+    name = f"{'hybrid' if hybrid else 'names'}-{seed}"
+    dim = embedder.model.get_sentence_embedding_dimension()
+    store = storage.Storage(
+        name, dim,
+        backend=NumpyVectorBackend(name, dim, root=root),
+        values_backend=NumpyVectorBackend(f"{name}-values", dim + SIGNATURE_STATS, root=root) if hybrid else None,
+    )
+
+    rng = np.random.default_rng(seed)
+    seed_rows = {feature: generate(rng, rows) for feature, (generate, _) in FEATURES.items()}
+    seed_df = pd.DataFrame(seed_rows)
+    profiles = [profile_column(seed_df[col]) for col in seed_df.columns]
+    store.load_vectors(
+        embedder.embed_text(*seed_df.columns), list(seed_df.columns),
+        value_signatures(profiles, embedder.embed_text) if hybrid else None,
+    )
+
+    correct = total = 0
+    for df, table_truth in tables:
+        truth.clear()
+        truth.update(table_truth)
+        texts = list(df.columns)
+        profiles = [profile_column(df[col]) for col in texts]
+        results = store.smart_load_batch(
+            embedder.embed_text(*texts), texts, profiles,
+            value_vectors=value_signatures(profiles, embedder.embed_text) if hybrid else None,
+        )
+        for text, (_, mapped) in zip(texts, results):
+            correct += mapped == table_truth[text]
+            total += 1
+    return len(asked), correct, total, dict(store.match_stats)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Count LLM escalations with and without value signatures.")
+    parser.add_argument("--tables", type=int, default=50, help="Synthetic tables to resolve")
+    parser.add_argument("--rows", type=int, default=300, help="Rows per table")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from embedding import Embedding
+
+    embedder = Embedding()
+    rng = np.random.default_rng(args.seed)
+    tables = [make_table(rng, args.rows) for _ in range(args.tables)]
+
+    with tempfile.TemporaryDirectory() as root:
+        for hybrid in (False, True):
+            asked, correct, total, stats = run(tables, embedder, root, hybrid, args.rows, args.seed)
+            label = "names + values" if hybrid else "names only"
+            print(f"{label:>15}: LLM columns {asked:4d}/{total}  correct {correct:4d}/{total}  {stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
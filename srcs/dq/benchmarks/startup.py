@@ -0,0 +1,87 @@
+"""
+Startup-time benchmark for the dq package.
+
+Measures how long `import data_quality` takes in a fresh interpreter and
+checks that no heavy modality dependency is imported eagerly. Exits with a
+non-zero status on regression, so it can guard CI.
+
+Run from srcs/dq:
+    python -m benchmarks.startup [--runs 5] [--budget 1.0]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Modules that must only be imported when a file of their modality is processed
+HEAVY_MODULES = (
+    "vosk",
+    "ffmpeg",
+    "PyPDF2",
+    "docx",
+    "pandas",
+    "numpy",
+    "openai",
+    "sentence_transformers",
+    "torch",
+    "qdrant_client",
+    "pymongo",
+)
+
+DQ_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def time_import(module: str = "data_quality") -> float:
+    """
+    Return the wall time in seconds of importing `module` in a fresh interpreter.
+    """
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], cwd=DQ_DIR, check=True)
+    return time.perf_counter() - start
+
+
+def eager_heavy_modules(module: str = "data_quality") -> list[str]:
+    """
+    Return the heavy modules that are loaded as a side effect of importing `module`.
+    """
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=DQ_DIR, check=True, capture_output=True, text=True
+    ).stdout.strip()
+    return [m for m in output.split(",") if m]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark `import data_quality` startup time.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of timed imports")
+    parser.add_argument("--budget", type=float, default=1.0, help="Maximum median seconds")
+    args = parser.parse_args()
+
+    # Baseline: a bare interpreter start, to report the package's own share
+    baseline = statistics.median(time_import("sys") for _ in range(args.runs))
+    timings = [time_import() for _ in range(args.runs)]
+    median = statistics.median(timings)
+    eager = eager_heavy_modules()
+
+    print(f"interpreter start:     {baseline * 1000:8.1f} ms")
+    print(f"import data_quality:   {median * 1000:8.1f} ms (median of {args.runs})")
+    print(f"package import cost:   {(median - baseline) * 1000:8.1f} ms")
+    print(f"eager heavy modules:   {', '.join(eager) or 'none'}")
+
+    failed = False
+    if eager:
+        print("FAIL: heavy modules are imported at startup")
+        failed = True
+    if median > args.budget:
+        print(f"FAIL: startup exceeds the {args.budget:.2f} s budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
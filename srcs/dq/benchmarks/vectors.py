@@ -0,0 +1,84 @@
+"""
+Vector backend benchmark.
+
+Loads the same random catalog into the Qdrant and the numpy backends of
+Storage and compares load time, single-query and batched search latency,
+and whether both return the same top-k neighbours.
+
+Run from srcs/dq:
+    python -m benchmarks.vectors [--points 20000] [--queries 256] [--qdrant-url http://localhost:6333]
+
+Without --qdrant-url, Qdrant runs in local in-memory mode, which leaves out
+the network round trips a real server adds to every request.
+"""
+import argparse
+import sys
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+from vector_backends.numpy_vector_backend import NumpyVectorBackend
+from vector_backends.qdrant_vector_backend import QdrantVectorBackend
+
+
+def make_backends(dim: int, root: str, qdrant_url: str = None) -> dict:
+    from qdrant_client import QdrantClient
+
+    name = f"bench-{uuid.uuid4().hex[:8]}"
+    client = QdrantClient(url=qdrant_url) if qdrant_url else QdrantClient(":memory:")
+    return {
+        "qdrant": QdrantVectorBackend(name, dim, client=client),
+        "numpy": NumpyVectorBackend(name, dim, root=root),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare the Qdrant and numpy vector backends.")
+    parser.add_argument("--points", type=int, default=20_000, help="Catalog size")
+    parser.add_argument("--dim", type=int, default=384, help="Vector dimensionality")
+    parser.add_argument("--queries", type=int, default=256, help="Number of queries")
+    parser.add_argument("--batch", type=int, default=64, help="Queries per batched search")
+    parser.add_argument("--k", type=int, default=5, help="Neighbours per query")
+    parser.add_argument("--qdrant-url", help="Qdrant server to benchmark instead of local mode")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.points, args.dim)).astype(np.float32)
+    ids = [str(uuid.uuid4()) for _ in range(args.points)]
+    payloads = [{"col": f"feature_{i}", "seq": i} for i in range(args.points)]
+    queries = vectors[rng.integers(0, args.points, args.queries)] + 0.1 * rng.standard_normal(
+        (args.queries, args.dim)
+    ).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as root:
+        neighbours = {}
+        for name, backend in make_backends(args.dim, root, args.qdrant_url).items():
+            start = time.perf_counter()
+            for i in range(0, args.points, 1000):
+                backend.upsert(ids[i : i + 1000], vectors[i : i + 1000], payloads[i : i + 1000])
+            load = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for query in queries:
+                backend.search(query, args.k)
+            single = (time.perf_counter() - start) / len(queries)
+
+            start = time.perf_counter()
+            hits = []
+            for i in range(0, len(queries), args.batch):
+                hits.extend(backend.search_batch(queries[i : i + args.batch], args.k))
+            batched = (time.perf_counter() - start) / len(queries)
+
+            neighbours[name] = [[str(hit.id) for hit in query_hits] for query_hits in hits]
+            print(f"{name:>7}: load {load:7.2f}s  search {single * 1e3:7.3f} ms/query"
+                  f"  batched {batched * 1e3:7.3f} ms/query")
+
+    same = sum(a == b for a, b in zip(neighbours["qdrant"], neighbours["numpy"]))
+    print(f"identical top-{args.k}: {same}/{len(queries)} queries")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
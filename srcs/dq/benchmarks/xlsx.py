@@ -0,0 +1,96 @@
+"""
+XLSX reading benchmark.
+
+Generates a large multi-sheet workbook and compares wall time and peak RSS of
+`pd.read_excel` (all sheets) with the streaming XLSXTableHandler, both
+reading whole sheets and iterating them in chunks. Each reader runs in a
+fresh interpreter so peak RSS is measured in isolation.
+
+Run from srcs/dq:
+    python -m benchmarks.xlsx [--rows 200000] [--cols 10] [--sheets 3]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+DQ_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+READERS = ("pandas", "handler", "handler_chunks")
+
+
+def generate_workbook(path: str, rows: int, cols: int, sheets: int) -> None:
+    """
+    Write a workbook of `sheets` sheets with `rows` x `cols` mixed-type cells.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for s in range(sheets):
+        worksheet = workbook.create_sheet(f"sheet_{s}")
+        worksheet.append([f"col_{c}" for c in range(cols)])
+        for r in range(rows):
+            worksheet.append([r * c if c % 3 == 0 else (r / 7 if c % 3 == 1 else f"value {r % 97}")
+                              for c in range(cols)])
+    workbook.save(path)
+
+
+def run_reader(reader: str, path: str) -> dict:
+    """
+    Read the workbook with one reader and return its wall time, peak RSS and row count.
+    """
+    start = time.perf_counter()
+    if reader == "pandas":
+        import pandas as pd
+        n_rows = sum(len(df) for df in pd.read_excel(path, sheet_name=None).values())
+    else:
+        from handlers.table_handlers.xlsx_table_handler import XLSXTableHandler
+        handler = XLSXTableHandler()
+        if reader == "handler":
+            n_rows = sum(len(df) for df in handler.handle_sheets(path).values())
+        else:
+            n_rows = sum(len(chunk) for _, chunk in handler.iter_sheets(path, chunk_rows=10_000))
+    seconds = time.perf_counter() - start
+    # ru_maxrss is in KiB on Linux
+    peak_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"reader": reader, "seconds": seconds, "peak_rss_mib": peak_mib, "rows": n_rows}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark XLSX reading time and peak memory.")
+    parser.add_argument("--rows", type=int, default=200_000, help="Rows per sheet")
+    parser.add_argument("--cols", type=int, default=10, help="Columns per sheet")
+    parser.add_argument("--sheets", type=int, default=3, help="Number of sheets")
+    parser.add_argument("--path", help="Benchmark an existing workbook instead of generating one")
+    parser.add_argument("--reader", choices=READERS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.reader:
+        print(json.dumps(run_reader(args.reader, args.path)))
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.path
+        if path is None:
+            path = os.path.join(tmp, "bench.xlsx")
+            print(f"Generating {args.sheets} x {args.rows} x {args.cols} workbook...")
+            generate_workbook(path, args.rows, args.cols, args.sheets)
+        print(f"Workbook size: {os.path.getsize(path) / 2 ** 20:.1f} MiB")
+
+        for reader in READERS:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.xlsx", "--reader", reader, "--path", path],
+                cwd=DQ_DIR, check=True, capture_output=True, text=True,
+            ).stdout
+            stats = json.loads(output.strip().splitlines()[-1])
+            print(f"{reader:>15}: {stats['seconds']:7.2f}s  peak RSS {stats['peak_rss_mib']:7.1f} MiB"
+                  f"  rows {stats['rows']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+import numpy as np
+import pandas as pd
+
+# Quantiles reported for numeric columns
+QUANTILES = (0.25, 0.5, 0.75)
+# Longest sample/category value rendered into a prompt
+MAX_VALUE_CHARS = 60
+
+
+def _to_python(value):
+    """
+    Convert numpy/pandas scalars into plain, compactly printable Python values.
+    """
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        return round(value, 4)
+    if isinstance(value, (int, bool)):
+        return value
+    text = str(value)
+    if len(text) > MAX_VALUE_CHARS:
+        text = text[:MAX_VALUE_CHARS] + "..."
+    return text
+
+
+def profile_column(series: pd.Series, top_n: int = 5, sample_size: int = 10, seed: int = 0) -> dict:
+    """
+    Build a compact, deterministic signature of a column.
+
+    All statistics are computed with vectorized pandas operations, so the
+    cost is one pass over the column regardless of how the result is used,
+    and the size of the signature does not depend on the number of rows.
+
+    Parameters
+    ----------
+    series : pd.Series
+        Column to summarize.
+    top_n : int
+        Number of most frequent values to report.
+    sample_size : int
+        Size of the uniform value sample.
+    seed : int
+        Seed of the sampling generator, so equal columns give equal samples.
+
+    Returns
+    -------
+    dict
+        Signature with dtype, row count, null rate, cardinality, numeric
+        statistics (numeric columns only), top values and a value sample.
+    """
+    n_rows = len(series)
+    non_null = series.dropna()
+
+    # Unhashable values (e.g. lists from nested JSON) are profiled as text
+    try:
+        counts = non_null.value_counts()
+    except TypeError:
+        non_null = non_null.astype(str)
+        counts = non_null.value_counts()
+
+    profile = {
+        "dtype": str(series.dtype),
+        "rows": n_rows,
+        "null_rate": round(1 - len(non_null) / n_rows, 4) if n_rows else 0.0,
+        "cardinality": len(counts),
+    }
+
+    if pd.api.types.is_numeric_dtype(non_null.dtype) and not pd.api.types.is_bool_dtype(non_null.dtype):
+        if len(non_null):
+            quantiles = non_null.quantile(list(QUANTILES))
+            profile["min"] = _to_python(non_null.min())
+            profile["max"] = _to_python(non_null.max())
+            profile["mean"] = _to_python(non_null.mean())
+            profile["quantiles"] = {str(q): _to_python(v) for q, v in zip(QUANTILES, quantiles)}
+
+    profile["top_values"] = [(_to_python(value), int(count)) for value, count in counts.head(top_n).items()]
+
+    # Seeded uniform sample without replacement, kept in column order
+    if len(non_null) > sample_size:
+        rng = np.random.default_rng(seed)
+        positions = np.sort(rng.choice(len(non_null), size=sample_size, replace=False))
+        sample = non_null.iloc[positions]
+    else:
+        sample = non_null
+    profile["sample"] = [_to_python(value) for value in sample]
+
+    return profile
+
+
+def format_profile(profile: dict) -> str:
+    """
+    Render a column signature as the XML fragment used in mapping prompts.
+
+    Parameters
+    ----------
+    profile : dict
+        Signature returned by `profile_column`.
+
+    Returns
+    -------
+    str
+        One XML element per signature field.
+    """
+    return "".join(f"<{key}>{value}</{key}>" for key, value in profile.items())
+
+
+# Statistics appended to the embedded values in a value signature, and
+# their share of the signature's cosine similarity
+SIGNATURE_STATS = 8
+SIGNATURE_STATS_WEIGHT = 0.3
+
+
+def _squash(value) -> float:
+    """
+    Map a number of any magnitude into roughly [-1, 1] on a log scale.
+    """
+    if not isinstance(value, (int, float)):
+        return 0.0
+    return float(np.sign(value) * np.log10(1 + abs(value)) / 10)
+
+
+def signature_stats(profile: dict) -> np.ndarray:
+    """
+    Encode the type and distribution statistics of a column signature.
+
+    Parameters
+    ----------
+    profile : dict
+        Signature returned by `profile_column`.
+
+    Returns
+    -------
+    np.ndarray
+        `SIGNATURE_STATS` values: numeric/datetime/other type flags, null
+        rate, distinct ratio and the log-scaled minimum, maximum and mean.
+    """
+    dtype = profile["dtype"].lower()
+    is_numeric = "min" in profile
+    is_datetime = "datetime" in dtype or "timestamp" in dtype
+    non_null = profile["rows"] * (1 - profile["null_rate"])
+    return np.array([
+        float(is_numeric),
+        float(is_datetime),
+        float(not is_numeric and not is_datetime),
+        profile["null_rate"],
+        profile["cardinality"] / non_null if non_null else 0.0,
+        _squash(profile.get("min")),
+        _squash(profile.get("max")),
+        _squash(profile.get("mean")),
+    ], dtype=np.float32)
+
+
+def signature_text(profile: dict) -> str:
+    """
+    Render the values of a column signature as the text that gets embedded.
+    """
+    values = [value for value, _ in profile["top_values"]] + list(profile["sample"])
+    return "values: " + ", ".join(str(value) for value in values)
+
+
+def value_signatures(profiles: list[dict], embed) -> np.ndarray:
+    """
+    Build one value-signature vector per column from its signature.
+
+    A value signature describes what a column holds rather than what it is
+    called: the embedding of its top and sampled values, followed by its
+    type and distribution statistics. Both parts are unit-normalized and
+    weighted, so the cosine similarity of two signatures is
+    `(1 - SIGNATURE_STATS_WEIGHT)` times the similarity of their values
+    plus `SIGNATURE_STATS_WEIGHT` times that of their statistics.
+
+    Parameters
+    ----------
+    profiles : list[dict]
+        Signatures returned by `profile_column`.
+    embed : callable
+        Text embedding function taking several texts, e.g. `embed_text`.
+
+    Returns
+    -------
+    np.ndarray
+        A float32 array of shape (len(profiles), embedding size + SIGNATURE_STATS).
+    """
+    if not profiles:
+        return np.empty((0, SIGNATURE_STATS), dtype=np.float32)
+
+    values = np.asarray(embed(*(signature_text(profile) for profile in profiles)), dtype=np.float32)
+    stats = np.stack([signature_stats(profile) for profile in profiles])
+
+    def unit(matrix):
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, np.finfo(np.float32).tiny)
+
+    return np.hstack([
+        unit(values) * np.sqrt(1 - SIGNATURE_STATS_WEIGHT),
+        unit(stats) * np.sqrt(SIGNATURE_STATS_WEIGHT),
+    ]).astype(np.float32)
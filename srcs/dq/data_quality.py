@@ -1,17 +1,15 @@
-from handlers.text_handlers.pdf_text_handler import PDFTextHandler
-from handlers.text_handlers.docx_text_handler import DocxTextHandler
-from handlers.text_handlers.txt_text_handler import TxtTextHandler
+import argparse
+import importlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
-from handlers.table_handlers.csv_table_handler import CSVTableHandler
-from handlers.table_handlers.xlsx_table_handler import XLSXTableHandler
-from handlers.table_handlers.json_table_handler import JSONTableHandler
-
-from handlers.audio_handlers.generic_audio_handler import GenericAudioHandler
-
-from wrapper import process_df
-
-from agent import call_agent, prompt
 from db_manager import MongoDBManager
+from resources import get_result_cache
+from result_cache import file_digest
+
+# Default number of threads used by process_many for I/O-bound work
+DEFAULT_IO_WORKERS = 8
 
 
 class DataQualityProcessor:
@@ -19,26 +17,29 @@ class DataQualityProcessor:
     Handles data quality pipeline: file type detection, transcription, summarization, table cleaning, mapping.
     Does NOT handle DB saving.
     """
-    # Registry mapping file extensions to handler methods
+    # Registry mapping file extensions to handler classes, given as
+    # "module:Class" and imported on first use of the extension, so only the
+    # modalities actually processed pay for their dependencies
     _audio_handlers = {
-        '.wav': GenericAudioHandler,
-        '.mp3': GenericAudioHandler,
-        '.m4a': GenericAudioHandler,
+        '.wav': 'handlers.audio_handlers.generic_audio_handler:GenericAudioHandler',
+        '.mp3': 'handlers.audio_handlers.generic_audio_handler:GenericAudioHandler',
+        '.m4a': 'handlers.audio_handlers.generic_audio_handler:GenericAudioHandler',
     }
     _text_handlers = {
-        '.pdf': PDFTextHandler,
-        '.docx': DocxTextHandler,
-        '.txt': TxtTextHandler,
-        '.md': TxtTextHandler,
+        '.pdf': 'handlers.text_handlers.pdf_text_handler:PDFTextHandler',
+        '.docx': 'handlers.text_handlers.docx_text_handler:DocxTextHandler',
+        '.txt': 'handlers.text_handlers.txt_text_handler:TxtTextHandler',
+        '.md': 'handlers.text_handlers.txt_text_handler:TxtTextHandler',
     }
     _table_handlers = {
-        '.csv': CSVTableHandler,
-        '.xlsx': XLSXTableHandler,
-        '.json': JSONTableHandler,
+        '.csv': 'handlers.table_handlers.csv_table_handler:CSVTableHandler',
+        '.xlsx': 'handlers.table_handlers.xlsx_table_handler:XLSXTableHandler',
+        '.json': 'handlers.table_handlers.json_table_handler:JSONTableHandler',
     }
 
     def __init__(self):
         self.db_manager = MongoDBManager()
+        self.cache = get_result_cache()
         self.result = {}
 
     def process(self, filename: str, metadata: dict) -> dict:
@@ -51,77 +52,337 @@ class DataQualityProcessor:
             - Activity: str
             - Ingestion time: str
         """
+        self.result = self._process_file(filename, metadata)
+        return self.result
+
+    def process_many(self, paths: list[str], metadata, audio_workers: int = None,
+                     io_workers: int = DEFAULT_IO_WORKERS, db_batch_size: int = 100,
+                     db_flush_interval: float = 1.0) -> list[dict]:
+        """
+        Process many files concurrently, each with its own isolated result.
+
+        Audio transcription (CPU-bound) runs in a process pool of
+        `audio_workers` processes; extraction, LLM calls and DB writes
+        (I/O-bound) run in a thread pool of `io_workers` threads. Records are
+        written to MongoDB in unordered batches by a buffered writer; a
+        record that fails to be written gets a "db_error" in its result.
+
+        Parameters:
+        - paths: Files to process.
+        - metadata: One metadata dict for all files, or a list aligned with `paths`.
+        - audio_workers: Transcription processes (defaults to the CPU count).
+        - io_workers: Threads processing files.
+        - db_batch_size: Records per MongoDB batch write.
+        - db_flush_interval: Maximum seconds a record waits in the write buffer.
+
+        Returns:
+        - One result dict per path, in the order of `paths`.
+        """
+        paths = list(paths)
+        if isinstance(metadata, dict):
+            metadata = [metadata] * len(paths)
+
+        has_audio = any(self._extension(path) in self._audio_handlers for path in paths)
+        audio_pool = None
+        if has_audio:
+            # spawn: forking a process that runs threads is not safe
+            audio_pool = ProcessPoolExecutor(
+                max_workers=audio_workers or os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+        db_errors = {}
+        try:
+            with self.db_manager.buffered(
+                db_batch_size, db_flush_interval,
+                # Keyed by record id: different paths can share a file name
+                on_error=lambda record, error: db_errors.setdefault(str(record.get("_id")), error),
+            ) as writer, ThreadPoolExecutor(max_workers=io_workers) as io_pool:
+                futures = [
+                    io_pool.submit(self._process_file, path, file_metadata, audio_pool, writer)
+                    for path, file_metadata in zip(paths, metadata)
+                ]
+                results = []
+                for path, future in zip(paths, futures):
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        results.append({"filename": path.lower(), "error": str(e)})
+
+            for result in results:
+                if result.get("record_id") in db_errors:
+                    result["db_error"] = db_errors[result["record_id"]]
+            return results
+        finally:
+            if audio_pool is not None:
+                audio_pool.shutdown()
+
+    def ingest_directory(self, folder: str, metadata: dict, recursive: bool = False, **workers) -> list[dict]:
+        """
+        Process every supported file in `folder` with `process_many`.
+
+        Parameters:
+        - folder: Directory to ingest.
+        - metadata: Metadata applied to every file.
+        - recursive: Also ingest subdirectories.
+        - workers: `audio_workers` / `io_workers` passed to `process_many`.
+        """
+        supported = (*self._audio_handlers, *self._text_handlers, *self._table_handlers)
+        paths = []
+        for dirpath, dirnames, filenames in os.walk(folder):
+            paths.extend(
+                os.path.join(dirpath, name) for name in sorted(filenames)
+                if self._extension(name) in supported
+            )
+            if not recursive:
+                break
+        return self.process_many(paths, metadata, **workers)
+
+    @staticmethod
+    def _handler_class(spec: str):
+        """
+        Import and return the handler class named by a "module:Class" spec.
+        """
+        module_name, class_name = spec.split(":")
+        return getattr(importlib.import_module(module_name), class_name)
+
+    @staticmethod
+    def _extension(filename: str) -> str:
+        return f'.{filename.lower().split('.')[-1]}'
+
+    def _process_file(self, filename: str, metadata: dict, audio_pool=None, writer=None) -> dict:
+        """
+        Run the whole pipeline for one file and return its result dict.
+
+        Keeps all per-file state local, so it can run concurrently. Audio is
+        transcribed in `audio_pool` if given, and the record is saved through
+        `writer` (e.g. a BufferedMongoWriter) if given.
+        """
+        # Imported here so that importing this module stays cheap
+        from summarizer import summarize, summarize_pages, summary_version
+        from wrapper import catalog_has, map_columns, mapping_version
+        from handlers.table_handlers.abstract_table_handler import SAMPLE_ROWS
+
         fname = filename.lower()
-        self.result = {"filename": fname, "metadata": metadata}
+        result = {"filename": fname, "metadata": metadata}
 
-        ext = f'.{fname.split('.')[-1]}'
+        ext = self._extension(fname)
         file_path = filename  # Assume filename is the full path
 
         try:
+            # Results are cached by file content, so re-uploads are not reprocessed
+            if ext in self._audio_handlers or ext in self._text_handlers or ext in self._table_handlers:
+                digest = file_digest(file_path)
+
             # Audio
             if ext in self._audio_handlers:
-                handler_cls = self._audio_handlers[ext]
+                handler_cls = self._handler_class(self._audio_handlers[ext])
                 handler = handler_cls()
-                summary = handler.handle(file_path)
-                self.result["summary"] = summary
+                if audio_pool is None:
+                    transcribe = lambda: handler.transcribe(file_path)
+                else:
+                    transcribe = lambda: audio_pool.submit(handler.transcribe, file_path).result()
+                text = self.cache.get_or_compute(
+                    self.cache.key("transcript", digest, handler_cls.__name__, handler.version),
+                    transcribe,
+                )
+                result["summary"] = self.cache.get_or_compute(
+                    self.cache.key("summary", digest, summary_version()),
+                    lambda: summarize(text),
+                )
             # Text
             elif ext in self._text_handlers:
-                handler_cls = self._text_handlers[ext]
+                handler_cls = self._handler_class(self._text_handlers[ext])
                 handler = handler_cls()
-                text = handler.handle(file_path)
-                summary = call_agent(prompt, text)
-                # self.result["summary"] = self.summarize_text(text)
-                self.result["summary"] = summary
+                # Handlers whose output format changed carry a version, which
+                # invalidates the text and summaries cached from older output
+                version = (handler.version,) if hasattr(handler, "version") else ()
+                text_key = self.cache.key("text", digest, handler_cls.__name__, *version)
+                summary_key = self.cache.key("summary", digest, summary_version(), *version)
+                text = self.cache.get(text_key)
+                if text is None and hasattr(handler, "iter_pages"):
+                    # Stream pages into the summarizer, so summarizing starts
+                    # before the last page is extracted
+                    pages = []
+
+                    def stream_pages():
+                        for page in handler.iter_pages(file_path):
+                            pages.append(page)
+                            yield page
+
+                    result["summary"] = self.cache.get_or_compute(
+                        summary_key,
+                        lambda: summarize_pages(stream_pages()),
+                    )
+                    if pages:
+                        self.cache.put(text_key, "\n\f".join(pages))
+                else:
+                    if text is None:
+                        text = handler.handle(file_path)
+                        self.cache.put(text_key, text)
+                    # result["summary"] = self.summarize_text(text)
+                    result["summary"] = self.cache.get_or_compute(
+                        summary_key,
+                        lambda: summarize(text),
+                    )
             # Table
             elif ext in self._table_handlers:
-                handler_cls = self._table_handlers[ext]
+                handler_cls = self._handler_class(self._table_handlers[ext])
                 handler = handler_cls()
-                table_result = handler.handle(file_path)
-                self.result["result_df"] = table_result
 
-                # mapping
-                mapped_df = process_df(self.result["result_df"])
-                self.result["result_df"] = mapped_df
+                def cached_mapping(key, sample):
+                    # Cached as (column, new_name) pairs to keep non-string
+                    # names, with the renames map_columns had to skip and the
+                    # catalog features the mapping relies on
+                    mapping = self.cache.get(key)
+                    # A catalog that lost those features (e.g. was reset) is
+                    # mapped again, which also registers them again
+                    if mapping is not None and catalog_has(mapping.get("features", [])):
+                        return mapping
+
+                    table = sample()
+                    skipped = []
+                    renames = list(map_columns(table, skipped=skipped).items())
+                    renamed = {column for column, _ in renames}
+                    unchanged = {entry["column"] for entry in skipped}
+                    features = [feature for _, feature in renames]
+                    features += [entry["feature"] for entry in skipped]
+                    # Columns kept as they are were matched or added under their own name
+                    features += [
+                        str(column) for column in table.columns
+                        if column not in renamed and str(column) not in unchanged
+                    ]
+                    mapping = {"renames": renames, "skipped": skipped, "features": features}
+                    self.cache.put(key, mapping)
+                    return mapping
+
+                # Workbooks hold one table per sheet; every sheet is mapped and
+                # kept, and the first one is also the file's result_df. Cleaning,
+                # the quality report and save_table work on whole tables, so the
+                # whole workbook is held in memory here; the streaming reader
+                # only bounds the parser's memory, not the pipeline's
+                if hasattr(handler, "handle_sheets"):
+                    sheets = {}
+                    skipped = []
+                    for sheet, table in handler.handle_sheets(file_path).items():
+                        mapping = cached_mapping(
+                            self.cache.key("mapping", digest, sheet, *mapping_version()),
+                            lambda: table.head(SAMPLE_ROWS),
+                        )
+                        sheet_pairs = mapping["renames"]
+                        sheets[sheet] = table.rename(columns=dict(sheet_pairs)) if sheet_pairs else table
+                        skipped.extend({"sheet": str(sheet), **entry} for entry in mapping["skipped"])
+                    if skipped:
+                        result["skipped_renames"] = skipped
+                    result["result_df"] = next(iter(sheets.values()))
+                    if len(sheets) > 1:
+                        result["sheets"] = sheets
+                else:
+                    # mapping only needs the header and a sample of rows, so it runs
+                    # before the full read where the handler can sample cheaply;
+                    # otherwise the table is read once and sampled
+                    table_result = None
+                    if getattr(handler, "samples_cheaply", False):
+                        sample = lambda: handler.read_sample(file_path)
+                    else:
+                        table_result = handler.handle(file_path)
+                        sample = lambda: table_result.head(SAMPLE_ROWS)
+                    mapping = cached_mapping(self.cache.key("mapping", digest, *mapping_version()), sample)
+                    rename_pairs = mapping["renames"]
+                    if mapping["skipped"]:
+                        result["skipped_renames"] = mapping["skipped"]
+
+                    if table_result is None:
+                        table_result = handler.handle(file_path)
+                    result["result_df"] = table_result
+                    if rename_pairs:
+                        result["result_df"] = table_result.rename(columns=dict(rename_pairs))
             # Unsupported => error
             else:
-                self.result["error"] = "Unsupported file type"
-                return self.result
+                result["error"] = "Unsupported file type"
+                return result
         # if there was an error during handling
-        except RuntimeError as re:
-            self.result["error"] = str(re)
-            return self.result
+        except (RuntimeError, OSError) as re:
+            result["error"] = str(re)
+            return result
         
         # Apply cleaning and data quality check
-        self.clean_data()
-        self.data_quality_check()
+        self.clean_data(result)
+        self.data_quality_check(result)
 
-        if "summary" in self.result:
+        if "summary" in result:
             print("Saving summary to DB...")
-            self.save_to_mongo(self.result)
+            self.save_to_mongo(result, writer)
             print("\n\n")
-        elif "result_df" in self.result:
+        elif "result_df" in result:
             print("Saving mapped table to DB...")
-            self.save_to_mongo(self.result)
+            self.save_to_mongo(result, writer)
             print("\n\n")
 
-    def clean_data(self):
-        # Placeholder: implement data cleaning logic
-        if self.result["filename"].endswith(tuple(self._table_handlers.keys())):
-            print("Cleaning data...")
+        return result
 
-    def data_quality_check(self):
-        # Placeholder: implement data quality checking logic
-        if self.result["filename"].endswith(tuple(self._table_handlers.keys())):
-            print("Checking data quality...")
+    def clean_data(self, result: dict = None):
+        """
+        Clean the table of a result (every sheet of a workbook) in place.
 
-    def save_to_mongo(self, record: dict):
+        Types are normalized, numeric and date strings parsed, text trimmed
+        and case variants unified; see `quality.clean_table`. What was done
+        per column is kept in result["cleaning"] for `data_quality_check`.
+        """
+        result = self.result if result is None else result
+        if "result_df" not in result:
+            return
+        from quality import clean_table
+
+        tables = result.get("sheets", {None: result["result_df"]})
+        cleaned = {}
+        result["cleaning"] = {}
+        for name, df in tables.items():
+            cleaned[name], result["cleaning"][name] = clean_table(df)
+        result["result_df"] = next(iter(cleaned.values()))
+        if "sheets" in result:
+            result["sheets"] = cleaned
+
+    def data_quality_check(self, result: dict = None):
+        """
+        Attach a compact quality report to the result.
+
+        result["quality_report"] describes result_df (null, duplicate, range
+        and outlier counts and flags; see `quality.quality_report`); for
+        workbooks, result["sheet_reports"] holds the report of every sheet.
+        """
+        result = self.result if result is None else result
+        if "result_df" not in result:
+            return
+        from quality import quality_report
+
+        cleaning = result.pop("cleaning", {})
+        tables = result.get("sheets", {None: result["result_df"]})
+        reports = {name: quality_report(df, cleaning.get(name)) for name, df in tables.items()}
+        result["quality_report"] = next(iter(reports.values()))
+        if "sheets" in result:
+            result["sheet_reports"] = reports
+
+    def save_to_mongo(self, record: dict, writer=None):
         """
         record (dict):
             - metadata (dict): Metadata about the file.
             - summary (str) - optional: Summary text (for text/audio files).
             - result_df (DataFrame) - optional: Processed table data (for table files).
+            - sheets (dict) - optional: Processed table of every sheet, by name
+              (for workbooks with several sheets).
+            - quality_report (dict) - optional: Quality report of result_df.
+            - sheet_reports (dict) - optional: Quality report of every sheet, by name.
+            - skipped_renames (list) - optional: Column renames skipped because
+              the table already had a column of that name.
             - filename (str): Name of the file.
+        writer - optional: Object with a `save(dict)` method used instead of
+            the DB manager, e.g. a BufferedMongoWriter.
+
+        The id of the saved record is set as record["record_id"] (a string).
         """
+        from bson import ObjectId
+
         # Ensure required fields
         required_fields = ["Region", "School", "Ingestion_time", "Activity"]
         metadata = record.get("metadata", {})
@@ -129,7 +390,10 @@ class DataQualityProcessor:
             if field not in metadata:
                 raise ValueError(f"Missing required metadata field: {field}")
 
+        # The id is assigned here, so write errors reported later can be
+        # matched to this record
         mongo_record = {
+            "_id": ObjectId(),
             "region": metadata["Region"],
             "school": metadata["School"],
             "ingestion_time": metadata["Ingestion_time"],
@@ -139,21 +403,39 @@ class DataQualityProcessor:
         # Add summary if present
         if "summary" in record:
             mongo_record["summary"] = record["summary"]
-        # Add table data if present
-        if "result_df" in record:
-            df = record["result_df"]
-            # Add each column as a new feature/column in mongo_record
-            for col in df.columns:
-                # If column name already exists, append '_table' to avoid overwrite
-                key = col if col not in mongo_record else f"{col}_table"
-                mongo_record[key] = df[col].tolist()
-            # Optionally, also save the full table as records
-            mongo_record["table_data"] = df.to_dict(orient="records")
+        # Add table data if present: rows are stored once, in bounded chunks,
+        # and the record only keeps the table descriptor
+        if "sheets" in record:
+            # Multi-sheet workbook: every sheet is stored, the first one also
+            # as the record's "table"
+            mongo_record["sheets"] = [
+                {
+                    "name": str(name),
+                    "table": self.db_manager.save_table(df),
+                    "quality_report": record.get("sheet_reports", {}).get(name),
+                }
+                for name, df in record["sheets"].items()
+            ]
+            mongo_record["table"] = mongo_record["sheets"][0]["table"]
+        elif "result_df" in record:
+            mongo_record["table"] = self.db_manager.save_table(record["result_df"])
+        if "quality_report" in record:
+            mongo_record["quality_report"] = record["quality_report"]
+        if "skipped_renames" in record:
+            mongo_record["skipped_renames"] = record["skipped_renames"]
 
-        self.db_manager.save(mongo_record)
+        record["record_id"] = str(mongo_record["_id"])
+        (writer or self.db_manager).save(mongo_record)
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the data quality pipeline on files.")
+    parser.add_argument("--dir", help="Ingest every supported file in this directory")
+    parser.add_argument("--recursive", action="store_true", help="Also ingest subdirectories")
+    parser.add_argument("--audio-workers", type=int, default=None, help="Transcription processes")
+    parser.add_argument("--io-workers", type=int, default=DEFAULT_IO_WORKERS, help="I/O threads")
+    args = parser.parse_args()
+
     processor = DataQualityProcessor()
     sample_metadata = {
         "Region": "South",
@@ -161,22 +443,25 @@ if __name__ == "__main__":
         "Activity": "Annual Report",
         "Ingestion_time": "2024-06-01T10:00:00Z"
     }
-    # folder = "Data samples/"
-    # files_to_upload = [
-    #     folder + "PLMent_prepis.md",
-    #     folder + "2024_9_FG-PL-ucastnici_TRASCRIPT.docx",
-    #     folder + "Zaznam_FG_PedagogLidr_SKUPINA-B-android.mp3",
-    #     folder + "ZV Otevirame dvere kolegialni podpore_běh 1_12 2023 (Odpovědi).xlsx",
-    # ]
-    folder = "../../data/synthetic_samples/"
-    files_to_upload = [
-        folder + "modified_behavior_metrics.csv",
-        folder + "modified_clubs_random.json",
-        folder + "modified_grades_random.json",
-        folder + "modified_student_ranking.csv",
-        folder + "modified_teacher_performance.csv"
-    ]
-    for file in files_to_upload:
-        print(f"Processing file: {file}")
-        result = processor.process(file, sample_metadata)
-        
\ No newline at end of file
+    workers = {"audio_workers": args.audio_workers, "io_workers": args.io_workers}
+    if args.dir:
+        results = processor.ingest_directory(args.dir, sample_metadata, recursive=args.recursive, **workers)
+    else:
+        # folder = "Data samples/"
+        # files_to_upload = [
+        #     folder + "PLMent_prepis.md",
+        #     folder + "2024_9_FG-PL-ucastnici_TRASCRIPT.docx",
+        #     folder + "Zaznam_FG_PedagogLidr_SKUPINA-B-android.mp3",
+        #     folder + "ZV Otevirame dvere kolegialni podpore_běh 1_12 2023 (Odpovědi).xlsx",
+        # ]
+        folder = "../../data/synthetic_samples/"
+        files_to_upload = [
+            folder + "modified_behavior_metrics.csv",
+            folder + "modified_clubs_random.json",
+            folder + "modified_grades_random.json",
+            folder + "modified_student_ranking.csv",
+            folder + "modified_teacher_performance.csv"
+        ]
+        results = processor.process_many(files_to_upload, sample_metadata, **workers)
+    for result in results:
+        print(f"Processed file: {result['filename']}" + (f" (error: {result['error']})" if "error" in result else ""))
@@ -1,8 +1,13 @@
-from sentence_transformers import SentenceTransformer
+MODEL_NAME = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
 
 class Embedding:
-    def __init__(self):
-        self.model = SentenceTransformer("sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+    def __init__(self, model_name=MODEL_NAME):
+        # Imported here so that reading MODEL_NAME does not load torch
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
 
     def embed_text(self, *texts):
         return self.model.encode(texts)
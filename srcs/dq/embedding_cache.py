@@ -0,0 +1,204 @@
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+# On-disk cache location, overridable through the environment
+DEFAULT_CACHE_PATH = os.getenv(
+    "DQ_EMBEDDING_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "dq", "embeddings.sqlite3"),
+)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for the cache key.
+
+    Applies Unicode NFKC normalization, strips the ends and collapses inner
+    whitespace. Case is preserved because the embedding model is case-sensitive.
+    The model itself always receives the text unchanged.
+
+    Parameters
+    ----------
+    text : str
+        Raw text, e.g. a column name.
+
+    Returns
+    -------
+    str
+        Normalized text.
+    """
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", str(text))).strip()
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache: an in-memory LRU in front of a SQLite store.
+
+    Vectors are keyed by model name plus normalized text and stored on disk as
+    float32 blobs, so restarted workers start warm. Hit and miss counters are
+    exposed through `stats()`.
+    """
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_memory_items: int = 10000):
+        self.path = path
+        self.max_memory_items = max_memory_items
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        return f"{model_name}\x00{normalize_text(text)}"
+
+    def get_many(self, keys: list[str]) -> dict:
+        """
+        Look up many keys, first in memory and then on disk.
+
+        Parameters
+        ----------
+        keys : list[str]
+            Keys built with `make_key`.
+
+        Returns
+        -------
+        dict
+            Mapping from each found key to its float32 vector. Missing keys are absent.
+        """
+        found = {}
+        with self._lock:
+            disk_keys = []
+            for key in keys:
+                if key in found:
+                    continue
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+                    self._counters["memory_hits"] += 1
+                else:
+                    disk_keys.append(key)
+
+            # Query the disk tier in one statement per bounded group of keys
+            disk_keys = list(dict.fromkeys(disk_keys))
+            for i in range(0, len(disk_keys), 500):
+                group = disk_keys[i : i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(group))})",
+                    group,
+                ).fetchall()
+                for key, blob in rows:
+                    vector = np.frombuffer(blob, dtype=np.float32)
+                    found[key] = vector
+                    self._remember(key, vector)
+                    self._counters["disk_hits"] += 1
+
+            self._counters["misses"] += sum(1 for key in disk_keys if key not in found)
+        return found
+
+    def put_many(self, keys: list[str], vectors) -> None:
+        """
+        Store vectors in both tiers.
+
+        Parameters
+        ----------
+        keys : list[str]
+            Keys built with `make_key`.
+        vectors : Iterable[np.ndarray]
+            Vectors aligned with `keys`.
+        """
+        rows = []
+        with self._lock:
+            for key, vector in zip(keys, vectors):
+                vector = np.ascontiguousarray(vector, dtype=np.float32)
+                self._remember(key, vector)
+                rows.append((key, vector.tobytes()))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+            )
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """
+        Return hit/miss counters and tier sizes for cache sizing.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["hits"] = stats["memory_hits"] + stats["disk_hits"]
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+            stats["memory_items"] = len(self._memory)
+            stats["disk_items"] = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        return stats
+
+    def _remember(self, key, vector):
+        # Caller holds self._lock
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+
+class CachedEmbedding:
+    """
+    Drop-in replacement for `Embedding` that serves vectors from an `EmbeddingCache`.
+
+    The underlying model is only loaded on the first cache miss, so a fully
+    warm worker never pays the model load time.
+    """
+    def __init__(self, model_name: str, cache: EmbeddingCache, load_embedding):
+        self.model_name = model_name
+        self.cache = cache
+        self._load_embedding = load_embedding
+        self._embedding = None
+        self._lock = threading.Lock()
+
+    @property
+    def embedding(self):
+        with self._lock:
+            if self._embedding is None:
+                self._embedding = self._load_embedding()
+            return self._embedding
+
+    def embed_text(self, *texts):
+        """
+        Embed texts, serving repeated ones from the cache.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        # Only the keys are normalized; the model embeds the texts as given,
+        # as the first text seen under each key
+        keys = [EmbeddingCache.make_key(self.model_name, text) for text in texts]
+        found = self.cache.get_many(keys)
+
+        # Encode every distinct missing text in one forward pass
+        text_by_key = {}
+        for key, text in zip(keys, texts):
+            text_by_key.setdefault(key, text)
+        missing = [key for key in text_by_key if key not in found]
+        if missing:
+            missing_texts = [text_by_key[key] for key in missing]
+            vectors = self.embedding.embed_text(*missing_texts)
+            self.cache.put_many(missing, vectors)
+            found.update(zip(missing, np.asarray(vectors, dtype=np.float32)))
+
+        return np.stack([found[key] for key in keys])
+
+    def stats(self) -> dict:
+        return self.cache.stats()
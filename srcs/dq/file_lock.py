@@ -0,0 +1,83 @@
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Not POSIX: the lock only covers threads of this process
+    fcntl = None
+
+# Where lock files of collections without a directory of their own live
+DEFAULT_LOCK_DIR = os.getenv(
+    "DQ_LOCK_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "dq", "locks"),
+)
+
+
+class FileLock:
+    """
+    Exclusive lock shared by the threads and processes of one host.
+
+    Threads are serialized by a reentrant lock and processes by `flock` on
+    the lock file, taken on the outermost acquire. Use `file_lock` rather
+    than the constructor: `flock` locks belong to an open file, so a second
+    instance for the same path in the same process would block on the first.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def acquire(self):
+        self._lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            try:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            except BaseException:
+                self._lock.release()
+                raise
+            self._fd = fd
+        self._depth += 1
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            # Closing the file drops the flock
+            os.close(self._fd)
+            self._fd = None
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def file_lock(path: str) -> FileLock:
+    """
+    Return the process-wide lock of the file at `path`, creating its directory.
+
+    Parameters
+    ----------
+    path : str
+        Path of the lock file.
+
+    Returns
+    -------
+    FileLock
+        The same instance for every caller in the process.
+    """
+    path = os.path.abspath(path)
+    with _locks_guard:
+        lock = _locks.get(path)
+        if lock is None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            lock = _locks[path] = FileLock(path)
+        return lock
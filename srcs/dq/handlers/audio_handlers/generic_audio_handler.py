@@ -1,7 +1,10 @@
 from handlers.audio_handlers.abstract_audio_handler import AbstractAudioHandler
-from summarize_mp3 import transform_to_summary
+from summarize_mp3 import transform_to_summary, transform_to_transcript, VOSK_MODEL_PATH
 
 class GenericAudioHandler(AbstractAudioHandler):
+    # Identifies the transcription model in cache keys
+    version = VOSK_MODEL_PATH
+
     def handle(self, file_path: str) -> str:
         try:
             result_summary = transform_to_summary(file_path)
@@ -9,6 +12,12 @@ class GenericAudioHandler(AbstractAudioHandler):
         except Exception as e:
             raise RuntimeError(f"MP3 transcription failed: {file_path}, error: {e}")
 
+    def transcribe(self, file_path: str) -> str:
+        try:
+            return transform_to_transcript(file_path)
+        except Exception as e:
+            raise RuntimeError(f"MP3 transcription failed: {file_path}, error: {e}")
+
     def transcribe_audio(self, audio_data: bytes) -> str:
         # Placeholder for actual transcription tool
         return "[Simulated transcripted text from MP3 audio]"
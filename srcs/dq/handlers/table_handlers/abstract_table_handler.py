@@ -1,6 +1,22 @@
 from abc import ABC, abstractmethod
 
+# Rows read by `read_sample` for column mapping
+SAMPLE_ROWS = 1000
+
+
 class AbstractTableHandler(ABC):
+    # Whether `read_sample` parses less than the whole file; if not, callers
+    # read the table once and sample it themselves
+    samples_cheaply = False
+
     @abstractmethod
     def handle(self, file_path: str) -> dict:
         pass
+
+    def iter_chunks(self, file_path: str):
+        # Handlers that can read incrementally override this
+        yield self.handle(file_path)
+
+    def read_sample(self, file_path: str, nrows: int = SAMPLE_ROWS):
+        # Handlers that can stop reading early override this
+        return self.handle(file_path).head(nrows)
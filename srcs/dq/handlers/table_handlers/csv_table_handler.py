@@ -1,10 +1,51 @@
+import importlib.util
+
 import pandas as pd
-from handlers.table_handlers.abstract_table_handler import AbstractTableHandler
+from handlers.table_handlers.abstract_table_handler import AbstractTableHandler, SAMPLE_ROWS
+
+# pyarrow is optional: without it the handlers fall back to pandas defaults
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+DEFAULT_CHUNKSIZE = 100_000
+
 
 class CSVTableHandler(AbstractTableHandler):
+    """
+    Reads CSV files with the multithreaded pyarrow parser into Arrow-backed
+    dtypes when pyarrow is installed. `usecols` and `dtype` restrict and fix
+    what is parsed; `iter_chunks` streams files larger than memory.
+    """
+    def __init__(self, usecols=None, dtype=None, chunksize: int = DEFAULT_CHUNKSIZE):
+        self.usecols = usecols
+        self.dtype = dtype
+        self.chunksize = chunksize
+
+    def _options(self) -> dict:
+        options = {"usecols": self.usecols, "dtype": self.dtype}
+        if HAS_PYARROW:
+            options["dtype_backend"] = "pyarrow"
+        return options
+
     def handle(self, file_path: str) -> pd.DataFrame:
         try:
-            df = pd.read_csv(file_path)
+            engine = "pyarrow" if HAS_PYARROW else "c"
+            df = pd.read_csv(file_path, engine=engine, **self._options())
             return df
         except Exception as e:
             raise RuntimeError(f"CSV extraction failed: {file_path}, error: {e}")
+
+    def iter_chunks(self, file_path: str):
+        # The pyarrow engine cannot read in chunks, so chunks use the C parser
+        try:
+            with pd.read_csv(file_path, chunksize=self.chunksize, **self._options()) as reader:
+                yield from reader
+        except Exception as e:
+            raise RuntimeError(f"CSV extraction failed: {file_path}, error: {e}")
+
+    samples_cheaply = True
+
+    def read_sample(self, file_path: str, nrows: int = SAMPLE_ROWS) -> pd.DataFrame:
+        # Only the header and the first rows are parsed
+        try:
+            return pd.read_csv(file_path, nrows=nrows, **self._options())
+        except Exception as e:
+            raise RuntimeError(f"CSV extraction failed: {file_path}, error: {e}")
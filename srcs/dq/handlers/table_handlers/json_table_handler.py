@@ -1,10 +1,63 @@
 import pandas as pd
-from handlers.table_handlers.abstract_table_handler import AbstractTableHandler
+from handlers.table_handlers.abstract_table_handler import AbstractTableHandler, SAMPLE_ROWS
+from handlers.table_handlers.csv_table_handler import HAS_PYARROW, DEFAULT_CHUNKSIZE
+
 
 class JSONTableHandler(AbstractTableHandler):
+    """
+    Reads JSON tables into Arrow-backed dtypes when pyarrow is installed.
+    Line-delimited files (`lines=True`) are parsed with the pyarrow engine
+    and can be streamed in chunks; a single JSON document has to be parsed
+    as a whole.
+    """
+    def __init__(self, usecols=None, dtype=None, lines: bool = False,
+                 chunksize: int = DEFAULT_CHUNKSIZE):
+        self.usecols = usecols
+        self.dtype = dtype
+        self.lines = lines
+        self.chunksize = chunksize
+
+    def _options(self) -> dict:
+        options = {"lines": self.lines}
+        if self.dtype is not None:
+            options["dtype"] = self.dtype
+        if HAS_PYARROW:
+            options["dtype_backend"] = "pyarrow"
+        return options
+
+    def _select(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df if self.usecols is None else df[list(self.usecols)]
+
     def handle(self, file_path: str) -> pd.DataFrame:
         try:
-            df = pd.read_json(file_path)
-            return df
+            options = self._options()
+            if self.lines and HAS_PYARROW and self.dtype is None:
+                options["engine"] = "pyarrow"
+            df = pd.read_json(file_path, **options)
+            return self._select(df)
+        except Exception as e:
+            raise RuntimeError(f"JSON extraction failed: {file_path}, error: {e}")
+
+    def iter_chunks(self, file_path: str):
+        if not self.lines:
+            yield self.handle(file_path)
+            return
+        try:
+            with pd.read_json(file_path, chunksize=self.chunksize, **self._options()) as reader:
+                for chunk in reader:
+                    yield self._select(chunk)
+        except Exception as e:
+            raise RuntimeError(f"JSON extraction failed: {file_path}, error: {e}")
+
+    @property
+    def samples_cheaply(self) -> bool:
+        return self.lines
+
+    def read_sample(self, file_path: str, nrows: int = SAMPLE_ROWS) -> pd.DataFrame:
+        if not self.lines:
+            return self.handle(file_path).head(nrows)
+        # Only the first lines are parsed
+        try:
+            return self._select(pd.read_json(file_path, nrows=nrows, **self._options()))
         except Exception as e:
             raise RuntimeError(f"JSON extraction failed: {file_path}, error: {e}")
@@ -1,11 +1,91 @@
 import pandas as pd
-from handlers.table_handlers.abstract_table_handler import AbstractTableHandler
+from handlers.table_handlers.abstract_table_handler import AbstractTableHandler, SAMPLE_ROWS
+
+DEFAULT_CHUNK_ROWS = 50_000
 
 
 class XLSXTableHandler(AbstractTableHandler):
+    """
+    Streams workbooks with openpyxl's read-only mode, so parsing needs memory
+    for one chunk of rows rather than the workbook DOM. Every sheet is read;
+    `handle` returns the first one, like `pd.read_excel`, and `handle_sheets`
+    returns all of them.
+
+    Only `iter_sheets`, `iter_chunks` and `read_sample` keep memory bounded
+    by one chunk. `handle` and `handle_sheets` concatenate the chunks, so
+    the resulting DataFrames grow with the sheets they hold.
+    """
+    samples_cheaply = True
+
+    def __init__(self, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self.chunk_rows = chunk_rows
+
     def handle(self, file_path: str) -> pd.DataFrame:
-        try:
-            df = pd.read_excel(file_path)
+        for _, df in self.handle_sheets(file_path, max_sheets=1).items():
             return df
+        return pd.DataFrame()
+
+    def handle_sheets(self, file_path: str, max_sheets: int = None) -> dict:
+        """
+        Read every sheet (or the first `max_sheets`) into one DataFrame each,
+        keyed by sheet name in workbook order.
+
+        All the sheets are held in memory at once. Use `iter_sheets` to
+        process a workbook chunk by chunk.
+        """
+        sheets = {}
+        for sheet, chunk in self.iter_sheets(file_path, max_sheets=max_sheets):
+            sheets.setdefault(sheet, []).append(chunk)
+        return {sheet: pd.concat(chunks, ignore_index=True) for sheet, chunks in sheets.items()}
+
+    def iter_chunks(self, file_path: str):
+        for _, chunk in self.iter_sheets(file_path, max_sheets=1):
+            yield chunk
+
+    def read_sample(self, file_path: str, nrows: int = SAMPLE_ROWS) -> pd.DataFrame:
+        for _, chunk in self.iter_sheets(file_path, chunk_rows=nrows, max_sheets=1):
+            return chunk
+        return pd.DataFrame()
+
+    def iter_sheets(self, file_path: str, chunk_rows: int = None, max_sheets: int = None):
+        """
+        Lazily yield (sheet_name, DataFrame) pairs of at most `chunk_rows` rows.
+
+        The first non-empty row of a sheet is its header; empty rows are
+        skipped. Sheets without any data yield one empty DataFrame.
+        """
+        from openpyxl import load_workbook
+
+        chunk_rows = chunk_rows or self.chunk_rows
+        try:
+            workbook = load_workbook(file_path, read_only=True, data_only=True)
+        except Exception as e:
+            raise RuntimeError(f"XLSX extraction failed: {file_path}, error: {e}")
+
+        try:
+            for worksheet in workbook.worksheets[:max_sheets]:
+                header = None
+                rows = []
+                emitted = False
+                for row in worksheet.iter_rows(values_only=True):
+                    if all(value is None for value in row):
+                        continue
+                    if header is None:
+                        header = [
+                            f"Unnamed: {i}" if value is None else value
+                            for i, value in enumerate(row)
+                        ]
+                        continue
+                    # Read-only rows can be shorter or longer than the header
+                    row = tuple(row[:len(header)]) + (None,) * (len(header) - len(row))
+                    rows.append(row)
+                    if len(rows) >= chunk_rows:
+                        yield worksheet.title, pd.DataFrame(rows, columns=header)
+                        rows = []
+                        emitted = True
+                if rows or not emitted:
+                    yield worksheet.title, pd.DataFrame(rows, columns=header)
         except Exception as e:
             raise RuntimeError(f"XLSX extraction failed: {file_path}, error: {e}")
+        finally:
+            workbook.close()
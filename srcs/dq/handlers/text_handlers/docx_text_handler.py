@@ -1,14 +1,99 @@
-from docx import Document
+import zipfile
+import xml.etree.ElementTree as ET
 from handlers.text_handlers.abstract_text_handler import AbstractTextHandler
 
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_OFFICE_DOCUMENT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+
+
+def _main_part(archive: zipfile.ZipFile) -> str:
+    """
+    Return the name of the main document part, normally word/document.xml.
+    """
+    try:
+        rels = ET.fromstring(archive.read("_rels/.rels"))
+    except KeyError:
+        return "word/document.xml"
+    for rel in rels.iter(f"{_REL}Relationship"):
+        if rel.get("Type") == _OFFICE_DOCUMENT:
+            return rel.get("Target").lstrip("/")
+    return "word/document.xml"
+
 
 class DocxTextHandler(AbstractTextHandler):
+    """
+    Streams text out of word/document.xml without building an object model.
+
+    Paragraphs and table rows come out in document order; a table row is one
+    line with its cells separated by tabs, and nested tables are flattened
+    into the cell that holds them. Processed body elements are dropped while
+    parsing, so memory stays flat however long the document is.
+    """
+    # Identifies the extracted text format in cache keys (tables included)
+    version = "tables-1"
+
     def handle(self, file_path: str) -> str:
+        return "\n".join(self.iter_blocks(file_path))
+
+    def iter_blocks(self, file_path: str):
+        """
+        Lazily yield the text of each paragraph and table row, in order.
+        """
         try:
-            doc = Document(file_path)
-            text = []
-            for para in doc.paragraphs:
-                text.append(para.text)
-            return "\n".join(text)
+            with zipfile.ZipFile(file_path) as archive, archive.open(_main_part(archive)) as xml:
+                yield from self._iter_blocks(xml)
         except Exception as e:
             raise RuntimeError(f"DOCX extraction failed: {file_path}, error: {e}")
+
+    @staticmethod
+    def _iter_blocks(xml):
+        depth = 0
+        body = None
+        in_run = 0
+        tables = 0
+        parts = []       # text of the current paragraph
+        cell = []        # paragraphs of the current top-level table cell
+        row = []         # cells of the current top-level table row
+
+        for event, elem in ET.iterparse(xml, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                depth += 1
+                if tag == f"{_W}body":
+                    body = elem
+                elif tag == f"{_W}r":
+                    in_run += 1
+                elif tag == f"{_W}tbl":
+                    tables += 1
+                continue
+
+            depth -= 1
+            if tag == f"{_W}t":
+                parts.append(elem.text or "")
+            elif tag == f"{_W}r":
+                in_run -= 1
+            elif in_run and tag == f"{_W}tab":
+                # Outside runs, w:tab is a tab stop definition, not text
+                parts.append("\t")
+            elif in_run and tag in (f"{_W}br", f"{_W}cr"):
+                parts.append("\n")
+            elif tag == f"{_W}p":
+                text = "".join(parts)
+                parts = []
+                if tables:
+                    cell.append(text)
+                else:
+                    yield text
+            elif tag == f"{_W}tc" and tables == 1:
+                row.append(" ".join(text for text in cell if text))
+                cell = []
+            elif tag == f"{_W}tr" and tables == 1:
+                yield "\t".join(row)
+                row = []
+            elif tag == f"{_W}tbl":
+                tables -= 1
+
+            # document > body > block: drop each block once it is handled
+            if depth == 2 and body is not None:
+                body.clear()
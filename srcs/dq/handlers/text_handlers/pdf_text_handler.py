@@ -1,14 +1,83 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 from PyPDF2 import PdfReader
 from handlers.text_handlers.abstract_text_handler import AbstractTextHandler
 
+# Page-parallel extraction: number of worker processes (1 disables it),
+# number of consecutive pages extracted by one task and the page count below
+# which starting the pool costs more than it saves
+PDF_WORKERS = int(os.getenv("DQ_PDF_WORKERS", "1"))
+PAGES_PER_TASK = 16
+MIN_PARALLEL_PAGES = 200
+
+# The PDF opened once by each worker process
+_reader = None
+
+
+def _open_reader(file_path: str):
+    global _reader
+    _reader = PdfReader(file_path)
+
+
+def extract_page_range(start: int, stop: int) -> list[str]:
+    """
+    Extract the text of pages [start, stop) of the worker's PDF; runs in
+    worker processes started with `_open_reader`.
+    """
+    return [_reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
 
 class PDFTextHandler(AbstractTextHandler):
+    """
+    Extracts PDF text page by page.
+
+    With `workers` > 1 and at least `min_parallel_pages` pages, page ranges
+    of `pages_per_task` pages are extracted in a process pool whose workers
+    each open the PDF once; pages are still yielded in document order, as
+    soon as every page before them is done. Workers are capped at the CPU count.
+    """
+    def __init__(self, workers: int = PDF_WORKERS, pages_per_task: int = PAGES_PER_TASK,
+                 min_parallel_pages: int = MIN_PARALLEL_PAGES):
+        self.workers = workers
+        self.pages_per_task = pages_per_task
+        self.min_parallel_pages = min_parallel_pages
+
     def handle(self, file_path: str) -> str:
+        # Form feeds keep page boundaries for chunked summarization
+        return "\n\f".join(self.iter_pages(file_path))
+
+    def iter_pages(self, file_path: str):
+        """
+        Lazily yield the text of each page, in order.
+        """
         try:
             reader = PdfReader(file_path)
-            text = []
-            for page in reader.pages:
-                text.append(page.extract_text() or "")
-            return "\n".join(text)
+            n_pages = len(reader.pages)
+            workers = min(self.workers, os.cpu_count() or 1)
+            if workers <= 1 or n_pages < self.min_parallel_pages:
+                for page in reader.pages:
+                    yield page.extract_text() or ""
+                return
+
+            ranges = [
+                (start, min(start + self.pages_per_task, n_pages))
+                for start in range(0, n_pages, self.pages_per_task)
+            ]
+            # spawn: forking a process that runs threads is not safe
+            pool = ProcessPoolExecutor(
+                max_workers=min(workers, len(ranges)),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_open_reader,
+                initargs=(file_path,),
+            )
+            try:
+                futures = [pool.submit(extract_page_range, start, stop) for start, stop in ranges]
+                for future in futures:
+                    yield from future.result()
+            finally:
+                # Stop pending ranges if the consumer gives up early
+                pool.shutdown(cancel_futures=True)
         except Exception as e:
             raise RuntimeError(f"PDF extraction failed: {file_path}, error: {e}")
@@ -0,0 +1,157 @@
+import asyncio
+import random
+import threading
+import time
+import weakref
+
+import openai
+from openai import AsyncOpenAI
+
+# Errors worth retrying: network problems, timeouts, throttling and server faults
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+    asyncio.TimeoutError,
+)
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter shared by all threads and event loops.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; every
+    request takes one token and waits asynchronously when none is left.
+    """
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _try_take(self) -> float:
+        """
+        Take a token if available; otherwise return the seconds until one is.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    async def acquire(self) -> None:
+        while True:
+            wait = self._try_take()
+            if wait == 0.0:
+                return
+            await asyncio.sleep(wait)
+
+
+class AsyncLLMClient:
+    """
+    Asyncio chat-completion client with concurrency, rate and retry control.
+
+    At most `max_concurrency` requests are in flight per event loop, request
+    starts are limited to `rate_per_second` (with bursts up to `burst`), each
+    attempt is bounded by `timeout` seconds, and retryable failures are
+    retried with exponential backoff and full jitter.
+    """
+    def __init__(self, base_url: str, api_key: str, max_concurrency: int = 8,
+                 rate_per_second: float = 4.0, burst: int = 8, timeout: float = 120.0,
+                 max_retries: int = 5, backoff_base: float = 1.0, backoff_max: float = 30.0):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.bucket = TokenBucket(rate_per_second, burst)
+
+        # asyncio primitives and HTTP connections are bound to one event loop
+        self._per_loop = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _loop_state(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._per_loop.get(loop)
+            if state is None:
+                client = AsyncOpenAI(base_url=self.base_url, api_key=self.api_key, max_retries=0)
+                state = (asyncio.Semaphore(self.max_concurrency), client)
+                self._per_loop[loop] = state
+            return state
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def complete(self, model: str, messages: list[dict], **kwargs) -> str:
+        """
+        Run one chat completion and return the text of the first choice.
+
+        Parameters
+        ----------
+        model : str
+            Model identifier.
+        messages : list[dict]
+            Chat messages.
+        **kwargs
+            Extra arguments for `chat.completions.create`.
+
+        Returns
+        -------
+        str
+            The model output.
+        """
+        semaphore, client = self._loop_state()
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with semaphore:
+                    await self.bucket.acquire()
+                    response = await asyncio.wait_for(
+                        client.chat.completions.create(model=model, messages=messages, **kwargs),
+                        timeout=self.timeout,
+                    )
+                return response.choices[0].message.content
+            except RETRYABLE_ERRORS:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+
+
+_background_loop = None
+_background_lock = threading.Lock()
+
+
+def submit(coro):
+    """
+    Schedule a coroutine on the shared background event loop without waiting.
+
+    Returns a `concurrent.futures.Future`, so synchronous code can start
+    several calls and collect their results later.
+    """
+    global _background_loop
+
+    with _background_lock:
+        if _background_loop is None:
+            _background_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_background_loop.run_forever, name="llm-event-loop", daemon=True
+            ).start()
+
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop)
+
+
+def run_sync(coro):
+    """
+    Run a coroutine on the shared background event loop and wait for its result.
+
+    Works from any thread, including threads that already run an event loop,
+    and keeps all synchronous callers on one loop so they share its limits.
+    """
+    return submit(coro).result()
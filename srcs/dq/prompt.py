@@ -1,4 +1,6 @@
+import json
 from agent import call_agent
+from column_profile import format_profile
 
 
 def create_prompt(source_features: list[str]) -> str:
@@ -56,13 +58,23 @@ def create_user_message(target_feature: str, target_feature_values) -> str:
     target_feature : str
         Name of the feature to classify.
     target_feature_values : Any
-        Values associated with the target feature, typically numeric or categorical.
+        Values associated with the target feature, typically numeric or categorical,
+        or a column signature built by `column_profile.profile_column`.
 
     Returns
     -------
     str
         The XML representation of the target feature description.
     """
+    # A column signature keeps the message small regardless of the row count
+    if isinstance(target_feature_values, dict):
+        return f"""
+<target_feature>
+    <name>{target_feature}</name>
+    <profile>{format_profile(target_feature_values)}</profile>
+</target_feature>
+"""
+
     return f"""
 <target_feature>
     <name>{target_feature}</name>
@@ -81,18 +93,192 @@ def map_feature(target_feature: str, target_feature_values, source_features: lis
     target_feature : str
         Feature name to be mapped.
     target_feature_values : Any
-        Data describing the target feature.
+        Data describing the target feature, raw values or a column signature.
     source_features : list[str]
         List of all possible feature names to match against.
 
     Returns
     -------
     str
-        Either a matched feature name or 'NAN'.
+        Either a matched feature name or 'NAN'. An answer that is not one
+        of `source_features` counts as 'NAN'.
     """
     # Construct full system prompt and user message
     prompt = create_prompt(source_features)
     user_message = create_user_message(target_feature, target_feature_values)
 
     # Query the model and return its one-token decision
-    return call_agent(prompt, user_message)
+    return validate_answer(call_agent(prompt, user_message), source_features) or "NAN"
+
+
+def validate_answer(answer, options) -> str | None:
+    """
+    Return the model's answer for one target if it is 'NAN' or one of
+    `options`, stripped of surrounding whitespace, and None otherwise.
+    """
+    if not isinstance(answer, str):
+        return None
+    answer = answer.strip()
+    if answer == "NAN" or answer in options:
+        return answer
+    return None
+
+
+def create_batch_prompt(source_features: list[str] | None) -> str:
+    """
+    Build a system prompt instructing the model to map several target
+    features at once and answer with a JSON object.
+
+    Parameters
+    ----------
+    source_features : list[str] | None
+        Feature names shared by all targets, or None when every target
+        carries its own <candidates> list.
+
+    Returns
+    -------
+    str
+        A formatted prompt containing task rules and the source feature list.
+    """
+    if source_features is None:
+        features_block = ""
+        candidates_rule = "<rule>Each target may only be mapped to a name from its own candidates list.</rule>"
+    else:
+        features_xml = ''.join(f'<feature>{sf}</feature>' for sf in source_features)
+        features_block = f"<source_features>{features_xml}</source_features>"
+        candidates_rule = "<rule>Each target may only be mapped to a name from the source_features list.</rule>"
+
+    return f"""
+<task>
+    You must determine, for each target feature, whether it logically corresponds to a known feature.
+    You will receive the target feature descriptions separately.
+    For every target, output the exact matching feature name if a match exists, otherwise exactly: NAN.
+</task>
+
+<rules>
+    {candidates_rule}
+    <rule>Respond with a single JSON object mapping every target name to a feature name or "NAN".</rule>
+    <rule>Include every target exactly once, using its name verbatim as the key.</rule>
+    <rule>No explanations, no comments, no reasoning, no text outside the JSON object.</rule>
+    <rule>Decisions must be based ONLY on the provided target feature descriptions.</rule>
+</rules>
+
+<input>
+    {features_block}
+</input>
+
+<output>
+</output>
+"""
+
+
+def create_batch_user_message(targets: dict, candidates: dict | None = None) -> str:
+    """
+    Create the user message listing all target features of one table.
+
+    Parameters
+    ----------
+    targets : dict
+        Mapping from target feature name to its values or column signature.
+    candidates : dict | None
+        Optional mapping from target feature name to its candidate feature names.
+
+    Returns
+    -------
+    str
+        The XML representation of all target feature descriptions.
+    """
+    blocks = []
+    for name, values in targets.items():
+        block = create_user_message(name, values)
+        if candidates is not None:
+            candidates_xml = ''.join(f'<feature>{c}</feature>' for c in candidates[name])
+            block = block.replace(
+                "</target_feature>",
+                f"    <candidates>{candidates_xml}</candidates>\n</target_feature>",
+            )
+        blocks.append(block)
+    return "<target_features>" + "".join(blocks) + "</target_features>"
+
+
+def parse_batch_response(response: str, allowed: dict) -> dict:
+    """
+    Parse and validate the model's JSON answer to a batch mapping prompt.
+
+    Parameters
+    ----------
+    response : str
+        Raw model output, possibly wrapped in a code fence. Anything that is
+        not a string (e.g. None for an empty completion) yields no answers.
+    allowed : dict
+        Mapping from target feature name to the feature names it may be mapped to.
+
+    Returns
+    -------
+    dict
+        Mapping from target feature name to a valid answer ('NAN' or an
+        allowed feature name). Targets with a missing or invalid answer are absent.
+    """
+    if not isinstance(response, str):
+        return {}
+    start, end = response.find("{"), response.rfind("}")
+    if start == -1 or end < start:
+        return {}
+    try:
+        answers = json.loads(response[start:end + 1])
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(answers, dict):
+        return {}
+
+    valid = {}
+    for name, options in allowed.items():
+        answer = validate_answer(answers.get(name), options)
+        if answer is not None:
+            valid[name] = answer
+    return valid
+
+
+def map_features(targets: dict, source_features: list[str], candidates: dict | None = None) -> dict:
+    """
+    Map all unresolved features of one table with a single model request.
+
+    Targets whose answer is missing or malformed are mapped again one by one
+    with `map_feature`, whose answers are validated the same way.
+
+    Parameters
+    ----------
+    targets : dict
+        Mapping from target feature name to its values or column signature.
+    source_features : list[str]
+        List of all possible feature names to match against. Ignored for
+        targets listed in `candidates`.
+    candidates : dict | None
+        Optional mapping from target feature name to a pruned list of
+        candidate feature names.
+
+    Returns
+    -------
+    dict
+        Mapping from each target feature name to a matched feature name or 'NAN'.
+    """
+    if not targets:
+        return {}
+
+    if candidates is None:
+        allowed = {name: set(source_features) for name in targets}
+        prompt = create_batch_prompt(source_features)
+    else:
+        allowed = {name: set(candidates[name]) for name in targets}
+        prompt = create_batch_prompt(None)
+    user_message = create_batch_user_message(targets, candidates)
+
+    results = parse_batch_response(call_agent(prompt, user_message), allowed)
+
+    # Per-feature fallback for answers the batch call did not deliver
+    for name, values in targets.items():
+        if name not in results:
+            options = source_features if candidates is None else candidates[name]
+            results[name] = map_feature(name, values, options)
+
+    return results
@@ -0,0 +1,407 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+# Rows processed at once; bounds the temporaries of cleaning and checking
+DEFAULT_CHUNK_ROWS = 250_000
+# Rows of a column inspected to decide how it is parsed
+INFER_SAMPLE_ROWS = 10_000
+# Share of non-null values that must parse for a text column to be converted
+PARSE_THRESHOLD = 0.95
+# Tukey fences: values beyond Q1 - k*IQR or Q3 + k*IQR are outliers
+OUTLIER_IQR_FACTOR = 1.5
+# Null rate above which a column is flagged
+HIGH_NULL_RATE = 0.5
+# Row positions reported as examples for each kind of issue
+MAX_EXAMPLES = 5
+
+# Spellings of missing values found in exported spreadsheets (compared lowercased)
+NULL_TOKENS = ("", "na", "n/a", "nan", "null", "none", "-", "?")
+
+# Quick pre-check for values that look like dates (1.2.2024, 2024-02-01, 01/02/24 ...)
+_DATE_LIKE = r"^\d{1,4}[-/.]\s?\d{1,2}[-/.]\s?\d{1,4}"
+
+
+def _is_text(series: pd.Series) -> bool:
+    """
+    Whether a column holds scalar text (possibly mixed with numbers), as
+    opposed to numbers, dates or nested values such as lists from JSON.
+    """
+    if not pd.api.types.is_object_dtype(series.dtype):
+        return pd.api.types.is_string_dtype(series.dtype)
+    sample = series.head(INFER_SAMPLE_ROWS).dropna()
+    # bool is an int subclass, but True/False columns are flags, not text
+    return bool(sample.map(
+        lambda value: isinstance(value, (str, int, float)) and not isinstance(value, bool)
+    ).all())
+
+
+def normalize_text(series: pd.Series) -> pd.Series:
+    """
+    Trim values, collapse inner whitespace and turn null spellings into NA.
+    """
+    text = series.astype("string").str.strip().str.replace(r"\s+", " ", regex=True)
+    return text.mask(text.str.lower().isin(NULL_TOKENS))
+
+
+def decimal_comma(text: pd.Series) -> bool:
+    """
+    Whether the commas of a numeric column are decimal separators: only when
+    no value has a '.' and none has a comma before a group of three digits.
+    """
+    return not (text.str.contains(".", regex=False).any()
+                or text.str.contains(r"\d,\d{3}(?:\D|$)", regex=True).any())
+
+
+def parse_numbers(text: pd.Series, comma_decimal: bool = False) -> pd.Series:
+    """
+    Parse numeric strings with digit-group separators; commas are decimal
+    separators if `comma_decimal` and group separators otherwise.
+    """
+    text = text.str.replace(r"(?<=\d)[\s '](?=\d{3}(?:\D|$))", "", regex=True)
+    if comma_decimal:
+        text = text.str.replace(r"^([+-]?\d+),(\d+)$", r"\1.\2", regex=True)
+    else:
+        text = text.str.replace(r"(?<=\d),(?=\d{3}(?:\D|$))", "", regex=True)
+    return pd.to_numeric(text, errors="coerce")
+
+
+def _date_format(text: pd.Series):
+    """
+    Guess one strptime format for a column from its first value, preferring
+    ISO order and reading other numeric dates day first (1.2.2024 is 1 February).
+    """
+    first = text.dropna().iloc[0]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        fmt = guess_datetime_format(first)
+        if fmt is None or not fmt.startswith("%Y"):
+            fmt = guess_datetime_format(first, dayfirst=True) or fmt
+    return fmt
+
+
+def parse_dates(text: pd.Series, fmt: str = None) -> pd.Series:
+    """
+    Parse date strings with a fixed format (vectorized), or day first per value.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        if fmt is not None:
+            return pd.to_datetime(text, format=fmt, errors="coerce")
+        return pd.to_datetime(text, format="mixed", dayfirst=True, errors="coerce")
+
+
+def parse_distinct(text: pd.Series, parse) -> pd.Series:
+    """
+    Apply `parse` once per distinct value and broadcast the results back.
+
+    Exported tables repeat the same dates, scores and codes over and over,
+    so parsing the distinct values only is much cheaper than parsing each
+    row; factorizing costs one hash pass.
+    """
+    codes, uniques = pd.factorize(text)
+    parsed = parse(pd.Series(uniques, dtype=text.dtype))
+    # Code -1 marks missing values, which take() fills with NA
+    return pd.Series(parsed.array.take(codes, allow_fill=True), index=text.index, name=text.name)
+
+
+def _is_arrow_temporal(series: pd.Series) -> bool:
+    # date32/timestamp[pyarrow] columns, e.g. ISO dates read by CSVTableHandler,
+    # which do not compare with pd.Timestamp
+    return isinstance(series.dtype, pd.ArrowDtype) and series.dtype.kind == "M"
+
+
+def plan_column(series: pd.Series, parse_threshold: float = PARSE_THRESHOLD) -> dict:
+    """
+    Decide from a sample how a column is cleaned.
+
+    Returns
+    -------
+    dict
+        "kind" is "numeric", "datetime" or "text" for text columns that are
+        parsed or normalized, and "keep" for columns left as they are; date
+        plans also carry the parse "format" and numeric plans whether commas
+        are decimal separators ("comma_decimal"). Arrow date and timestamp
+        columns are "datetime" too, converted without parsing.
+    """
+    if _is_arrow_temporal(series):
+        return {"kind": "datetime", "format": None}
+    if not _is_text(series):
+        return {"kind": "keep"}
+
+    sample = normalize_text(series.head(INFER_SAMPLE_ROWS)).dropna()
+    if sample.empty:
+        return {"kind": "text"}
+
+    comma_decimal = decimal_comma(sample)
+    if parse_numbers(sample, comma_decimal).notna().mean() >= parse_threshold:
+        return {"kind": "numeric", "comma_decimal": comma_decimal}
+
+    if sample.str.match(_DATE_LIKE).mean() >= parse_threshold:
+        fmt = _date_format(sample)
+        if parse_dates(sample, fmt).notna().mean() >= parse_threshold:
+            return {"kind": "datetime", "format": fmt}
+    return {"kind": "text"}
+
+
+def unify_case(text: pd.Series) -> pd.Series:
+    """
+    Replace spellings that differ only in case by the most frequent one.
+    """
+    counts = text.value_counts()
+    folded = counts.index.str.casefold()
+    if folded.nunique() == len(counts):
+        return text
+    # value_counts is sorted by frequency, so the first spelling of a group wins
+    canonical = pd.Series(counts.index, index=folded).groupby(level=0).first()
+    return text.str.casefold().map(canonical).astype(text.dtype)
+
+
+def clean_column(series: pd.Series, plan: dict, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """
+    Clean one column according to its plan, `chunk_rows` rows at a time.
+
+    Returns
+    -------
+    tuple[pd.Series, int]
+        The cleaned column and the number of non-null values that could not
+        be parsed (and became null).
+    """
+    kind = plan["kind"]
+    if kind == "keep":
+        return series, 0
+    if kind == "datetime" and _is_arrow_temporal(series):
+        # Already dates: only the dtype changes, to numpy datetime64
+        return pd.to_datetime(series), 0
+
+    parts = []
+    unparsed = 0
+    for start in range(0, max(len(series), 1), chunk_rows):
+        text = normalize_text(series.iloc[start : start + chunk_rows])
+        if kind == "numeric":
+            part = parse_distinct(text, lambda values: parse_numbers(values, plan.get("comma_decimal", False)))
+        elif kind == "datetime":
+            part = parse_distinct(text, lambda values: parse_dates(values, plan.get("format")))
+        else:
+            part = text
+        unparsed += int(text.notna().sum() - part.notna().sum())
+        parts.append(part)
+
+    cleaned = pd.concat(parts) if len(parts) > 1 else parts[0]
+    if kind == "text":
+        cleaned = unify_case(cleaned)
+    return cleaned.rename(series.name), unparsed
+
+
+def clean_table(df: pd.DataFrame, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                parse_threshold: float = PARSE_THRESHOLD):
+    """
+    Normalize the types and values of a table, one vectorized pass per column.
+
+    Text columns are trimmed, their whitespace collapsed, null spellings
+    ("", "N/A", "null", ...) turned into nulls and case variants of the same
+    value unified. Text columns whose values are almost all numbers or dates
+    are parsed into numeric or datetime columns. Work runs in chunks of
+    `chunk_rows` rows, so temporaries stay bounded on large tables.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Table to clean; it is not modified.
+    chunk_rows : int
+        Rows processed at once.
+    parse_threshold : float
+        Share of non-null values that must parse for a column to be converted.
+
+    Returns
+    -------
+    tuple[pd.DataFrame, list[dict]]
+        The cleaned table and, per column, what was done to it
+        ("cleaned_as" and the number of "unparsed" values).
+    """
+    columns = []
+    actions = []
+    for position in range(df.shape[1]):
+        series = df.iloc[:, position]
+        plan = plan_column(series, parse_threshold)
+        cleaned, unparsed = clean_column(series, plan, chunk_rows)
+        columns.append(cleaned)
+        actions.append({"cleaned_as": plan["kind"], "unparsed": unparsed})
+
+    if not columns:
+        return df.copy(), actions
+    out = pd.concat(columns, axis=1)
+    # Positional assembly keeps duplicate and non-string column names intact
+    out.columns = df.columns
+    return out, actions
+
+
+def _row_hashes(df: pd.DataFrame, chunk_rows: int) -> np.ndarray:
+    """
+    Hash every row to a uint64, chunk by chunk; unhashable values are hashed as text.
+    """
+    hashes = []
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start : start + chunk_rows]
+        try:
+            hashes.append(pd.util.hash_pandas_object(chunk, index=False).to_numpy())
+        except TypeError:
+            hashes.append(pd.util.hash_pandas_object(chunk.astype(str), index=False).to_numpy())
+    return np.concatenate(hashes) if hashes else np.empty(0, dtype=np.uint64)
+
+
+def _examples(mask: np.ndarray) -> list[int]:
+    return [int(i) for i in np.flatnonzero(mask)[:MAX_EXAMPLES]]
+
+
+def _scalar(value):
+    """
+    Convert numpy/pandas scalars into plain BSON-friendly values.
+    """
+    if value is None or value is pd.NaT or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        return round(value, 6)
+    return value
+
+
+def check_column(series: pd.Series, value_range: tuple = None) -> dict:
+    """
+    Compute the quality statistics and flags of one column.
+
+    Parameters
+    ----------
+    series : pd.Series
+        Column to check.
+    value_range : tuple, optional
+        Inclusive (min, max) of valid values; either bound may be None.
+
+    Returns
+    -------
+    dict
+        Null, distinct, range and outlier statistics, plus "flags" naming
+        the issues found.
+    """
+    n_rows = len(series)
+    nulls = int(series.isna().sum())
+    try:
+        distinct = int(series.nunique())
+    except TypeError:
+        distinct = int(series.astype(str).nunique())
+
+    report = {
+        "name": str(series.name),
+        "dtype": str(series.dtype),
+        "nulls": nulls,
+        "null_rate": round(nulls / n_rows, 4) if n_rows else 0.0,
+        "distinct": distinct,
+    }
+    flags = []
+    if n_rows and nulls == n_rows:
+        flags.append("all_null")
+    elif report["null_rate"] > HIGH_NULL_RATE:
+        flags.append("high_null_rate")
+    if distinct == 1 and n_rows > 1:
+        flags.append("constant")
+
+    is_numeric = pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype)
+    is_datetime = pd.api.types.is_datetime64_any_dtype(series.dtype)
+
+    if is_numeric and nulls < n_rows:
+        values = series.to_numpy(dtype="float64", na_value=np.nan)
+        q1, q3 = np.nanquantile(values, [0.25, 0.75])
+        low, high = q1 - OUTLIER_IQR_FACTOR * (q3 - q1), q3 + OUTLIER_IQR_FACTOR * (q3 - q1)
+        with np.errstate(invalid="ignore"):
+            outliers = (values < low) | (values > high)
+        report.update({
+            "min": _scalar(np.nanmin(values)),
+            "max": _scalar(np.nanmax(values)),
+            "mean": _scalar(np.nanmean(values)),
+            "outlier_fences": [_scalar(low), _scalar(high)],
+            "outliers": int(outliers.sum()),
+        })
+        if report["outliers"]:
+            flags.append("outliers")
+            report["outlier_rows"] = _examples(outliers)
+        if value_range is not None:
+            out_of_range = np.zeros(n_rows, dtype=bool)
+            with np.errstate(invalid="ignore"):
+                if value_range[0] is not None:
+                    out_of_range |= values < value_range[0]
+                if value_range[1] is not None:
+                    out_of_range |= values > value_range[1]
+            report["out_of_range"] = int(out_of_range.sum())
+            if report["out_of_range"]:
+                flags.append("out_of_range")
+                report["out_of_range_rows"] = _examples(out_of_range)
+    elif is_datetime and nulls < n_rows:
+        # Dates in the future are out of range for records of past activities
+        dates = pd.to_datetime(series) if _is_arrow_temporal(series) else series
+        now = pd.Timestamp.now(tz=getattr(dates.dtype, "tz", None))
+        future = (dates > now).to_numpy(dtype=bool, na_value=False)
+        report.update({
+            "min": _scalar(dates.min()),
+            "max": _scalar(dates.max()),
+            "out_of_range": int(future.sum()),
+        })
+        if report["out_of_range"]:
+            flags.append("out_of_range")
+            report["out_of_range_rows"] = _examples(future)
+
+    report["flags"] = flags
+    return report
+
+
+def quality_report(df: pd.DataFrame, cleaning: list[dict] = None, ranges: dict = None,
+                   chunk_rows: int = DEFAULT_CHUNK_ROWS) -> dict:
+    """
+    Build a compact quality report of a (cleaned) table.
+
+    The report size depends on the number of columns only: per-row issues
+    are reported as counts plus a few example row positions.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Table to check, usually the output of `clean_table`.
+    cleaning : list[dict], optional
+        Per-column actions returned by `clean_table`, merged into the report.
+    ranges : dict, optional
+        Valid (min, max) per column name, for range checks.
+    chunk_rows : int
+        Rows hashed at once for duplicate detection.
+
+    Returns
+    -------
+    dict
+        Row and duplicate counts, table-level "flags" and one entry per
+        column in "columns" (a list, so names need not be valid BSON keys).
+    """
+    ranges = ranges or {}
+    duplicates = pd.Series(_row_hashes(df, chunk_rows)).duplicated().to_numpy()
+
+    report = {
+        "rows": len(df),
+        "columns": [],
+        "duplicate_rows": int(duplicates.sum()),
+        "flags": [],
+    }
+    if report["duplicate_rows"]:
+        report["flags"].append("duplicate_rows")
+        report["duplicate_row_examples"] = _examples(duplicates)
+
+    for position in range(df.shape[1]):
+        series = df.iloc[:, position]
+        column = check_column(series, ranges.get(series.name))
+        if cleaning is not None:
+            column.update(cleaning[position])
+            if cleaning[position]["unparsed"]:
+                column["flags"].append("unparsed_values")
+        report["columns"].append(column)
+    return report
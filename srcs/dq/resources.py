@@ -0,0 +1,156 @@
+import threading
+
+
+class ResourceRegistry:
+    """
+    Process-wide cache of heavy resources (models and network clients).
+
+    Every resource is created lazily by its factory on first use and is then
+    shared by all callers in the process. Creation is thread-safe: each key
+    has its own lock, so a slow model load does not block unrelated clients.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._resources = {}
+
+    def get(self, key, factory):
+        """
+        Return the resource stored under `key`, creating it with `factory` once.
+
+        Parameters
+        ----------
+        key : Hashable
+            Identity of the resource, including everything that configures it.
+        factory : Callable[[], Any]
+            Zero-argument callable that builds the resource.
+
+        Returns
+        -------
+        Any
+            The shared resource instance.
+        """
+        # Fast path without locking once the resource exists
+        try:
+            return self._resources[key]
+        except KeyError:
+            pass
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            if key not in self._resources:
+                self._resources[key] = factory()
+            return self._resources[key]
+
+    def clear(self):
+        """
+        Forget all cached resources so that the next `get` creates them again.
+        """
+        with self._lock:
+            self._resources.clear()
+            self._key_locks.clear()
+
+
+# Shared registry used by the whole dq package
+registry = ResourceRegistry()
+
+
+def get_embedding_cache(path: str = None):
+    """
+    Return the shared two-tier embedding cache stored at `path`.
+    """
+    from embedding_cache import EmbeddingCache, DEFAULT_CACHE_PATH
+
+    path = path or DEFAULT_CACHE_PATH
+    return registry.get(("embedding_cache", path), lambda: EmbeddingCache(path))
+
+
+def get_embedder(model_name: str = None):
+    """
+    Return the shared cached sentence embedder.
+
+    The model itself is loaded on the first cache miss.
+    """
+    from embedding import Embedding, MODEL_NAME
+    from embedding_cache import CachedEmbedding
+
+    model_name = model_name or MODEL_NAME
+    return registry.get(
+        ("embedder", model_name),
+        lambda: CachedEmbedding(model_name, get_embedding_cache(), lambda: Embedding(model_name)),
+    )
+
+
+def get_qdrant_client(host: str = "localhost", port: int = 6333, timeout: float = 60.0,
+                      prefer_grpc: bool = False, grpc_port: int = 6334):
+    """
+    Return the shared Qdrant client for the given server and transport.
+    """
+    from qdrant_client import QdrantClient
+
+    return registry.get(
+        ("qdrant", host, port, timeout, prefer_grpc, grpc_port),
+        lambda: QdrantClient(host=host, port=port, timeout=timeout,
+                             prefer_grpc=prefer_grpc, grpc_port=grpc_port),
+    )
+
+
+def get_storage(name: str, embedding_size: int, backend: str = None):
+    """
+    Return the shared `Storage` for a collection, creating the collection once.
+
+    `backend` selects the vector backend (see `storage.VECTOR_BACKENDS`);
+    it defaults to `storage.VECTOR_BACKEND`.
+    """
+    from storage import Storage, VECTOR_BACKEND
+
+    backend = backend or VECTOR_BACKEND
+    return registry.get(
+        ("storage", name, embedding_size, backend),
+        lambda: Storage(name=name, embedding_size=embedding_size, backend=backend),
+    )
+
+
+def get_mongo_client(uri: str):
+    """
+    Return the shared MongoDB client for the given connection URI.
+    """
+    from pymongo import MongoClient
+
+    return registry.get(("mongo", uri), lambda: MongoClient(uri))
+
+
+def get_llm_client(base_url: str, api_key: str, **limits):
+    """
+    Return the shared rate-limited async client for the given endpoint.
+
+    `limits` are passed to `llm_client.AsyncLLMClient` (concurrency, rate,
+    timeout and retry settings).
+    """
+    from llm_client import AsyncLLMClient
+
+    return registry.get(
+        ("llm", base_url, api_key, tuple(sorted(limits.items()))),
+        lambda: AsyncLLMClient(base_url, api_key, **limits),
+    )
+
+
+def get_vosk_model(model_path: str):
+    """
+    Return the shared Vosk speech recognition model, loading it on first use.
+    """
+    from vosk import Model
+
+    return registry.get(("vosk", model_path), lambda: Model(model_path))
+
+
+def get_result_cache(root: str = None):
+    """
+    Return the shared content-addressed result cache stored under `root`.
+    """
+    from result_cache import ResultCache, DEFAULT_CACHE_DIR
+
+    root = root or DEFAULT_CACHE_DIR
+    return registry.get(("result_cache", root), lambda: ResultCache(root))
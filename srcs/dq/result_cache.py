@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+# Cache location and size limit, overridable through the environment
+DEFAULT_CACHE_DIR = os.getenv(
+    "DQ_RESULT_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "dq", "results"),
+)
+DEFAULT_MAX_BYTES = int(os.getenv("DQ_RESULT_CACHE_MAX_BYTES", str(1024 ** 3)))
+
+
+def file_digest(path: str, block_size: int = 1 << 20) -> str:
+    """
+    Return the SHA-256 hex digest of a file's bytes.
+
+    Parameters
+    ----------
+    path : str
+        Path to the file.
+    block_size : int
+        Number of bytes hashed per read.
+
+    Returns
+    -------
+    str
+        Content hash, independent of the file name and metadata.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+_MISSING = object()
+
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache for extracted text, transcripts, summaries
+    and table mappings.
+
+    Entries are JSON files named by a hash of their key parts (typically the
+    file content hash plus prompt and model versions). When the cache grows
+    beyond `max_bytes`, the least recently used entries are evicted.
+    """
+    def __init__(self, root: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._size = sum(size for _, size, _ in self._entries())
+
+    @staticmethod
+    def key(*parts) -> str:
+        """
+        Build a cache key from its parts; long parts such as prompts are hashed.
+        """
+        return hashlib.sha256("\x00".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.json")
+
+    def _entries(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith(".json"):
+                    path = os.path.join(dirpath, filename)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    yield path, stat.st_size, stat.st_mtime
+
+    def get(self, key: str, default=None):
+        """
+        Return the cached value for `key`, or `default` if it is not cached.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return default
+        # Touch the entry so eviction is least-recently-used
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return value
+
+    def put(self, key: str, value) -> None:
+        """
+        Store a JSON-serializable value under `key` and evict old entries if needed.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write atomically so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        size = os.path.getsize(tmp_path)
+
+        with self._lock:
+            try:
+                self._size -= os.path.getsize(path)
+            except FileNotFoundError:
+                pass
+            os.replace(tmp_path, path)
+            self._size += size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def get_or_compute(self, key: str, compute):
+        """
+        Return the cached value for `key`, computing and storing it on a miss.
+        """
+        # A sentinel, so that a cached None (JSON null) is a hit
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def _evict(self) -> None:
+        # Caller holds self._lock; drop oldest entries down to 90% of the limit
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        self._size = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for path, size, _ in entries:
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._size -= size
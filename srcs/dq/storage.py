@@ -1,31 +1,94 @@
-from prompt import map_feature
+from prompt import map_feature, map_features
+from vector_backends.abstract_vector_backend import Point
 
-from qdrant_client import QdrantClient
-from qdrant_client.models import VectorParams, Distance, PointStruct
+from collections import Counter
+from concurrent.futures import Future
+import importlib
 import numpy as np
-from embedding import Embedding
+import os
+import re
+import threading
+import time
 import uuid
 
+# How far back (in ns) an incremental catalog refresh looks to tolerate
+# clock skew between workers writing to the same collection
+CATALOG_SKEW_NS = 5_000_000_000
+
+# Vector index behind Storage, overridable through the environment. Backends
+# are given as "module:Class" and imported on first use
+VECTOR_BACKEND = os.getenv("DQ_VECTOR_BACKEND", "qdrant")
+VECTOR_BACKENDS = {
+    "qdrant": "vector_backends.qdrant_vector_backend:QdrantVectorBackend",
+    "numpy": "vector_backends.numpy_vector_backend:NumpyVectorBackend",
+}
+
+# Hybrid name + value matching (see smart_load_batch): weight of the name
+# score in the combined score, combined score and lead over the runner-up
+# needed to accept a match without the LLM, combined score below which a
+# column is new without asking the LLM, and neighbours fetched per query
+NAME_WEIGHT = 0.5
+ACCEPT_SCORE = 0.75
+ACCEPT_MARGIN = 0.05
+NEW_BELOW_SCORE = 0.35
+SIGNATURE_CANDIDATES = 10
+
+
+def normalize_name(text):
+    """
+    Returns the key under which concurrent lookups of a column name are
+    shared: case-folded, with runs of separators collapsed into one space
+    """
+    return re.sub(r"[\W_]+", " ", str(text).casefold()).strip()
+
+
 class Storage:
-    def __init__(self, name, embedding_size):  
+    def __init__(self, name, embedding_size, backend=None, values_backend=None):
         """
         Initializes the Storage class
 
-        Connects to the Qdrant client and ensures the collection exists,
-        creating it with the specified configuration if it doesn't
+        Opens the collection in a vector backend, creating it with the
+        specified configuration if it doesn't exist: the Qdrant server
+        ("qdrant") or an in-process, file-backed index ("numpy")
+
+        Also keeps a local catalog of stored feature names. Every point
+        carries a "seq" payload (upsert time in ns) that acts as the catalog
+        version, so the catalog is refreshed incrementally
 
         Args:
             name (str): The name of the collection to manage
             embedding_size (int): The dimensionality of the vectors (e.g., 384)
+            backend (str | AbstractVectorBackend, optional): A key of
+                VECTOR_BACKENDS or a backend instance. Defaults to VECTOR_BACKEND
+            values_backend (AbstractVectorBackend, optional): Index of the
+                value signatures. Defaults to the "<name>-values" collection
+                of the same backend kind when `backend` is a key, and to no
+                value matching when it is an instance
         """
-        self.client = QdrantClient(host="localhost", port=6333, timeout=60.0)
+        backend = backend or VECTOR_BACKEND
+        self._backend_cls = None
+        if isinstance(backend, str):
+            module_name, class_name = VECTOR_BACKENDS[backend].split(":")
+            self._backend_cls = getattr(importlib.import_module(module_name), class_name)
+            backend = self._backend_cls(name, embedding_size)
+        self.backend = backend
+        self.values_backend = values_backend
         self.collection_name = name
 
-        if not self.client.collection_exists(self.collection_name):
-            self.client.create_collection(
-                collection_name=self.collection_name,
-                vectors_config=VectorParams(size=embedding_size, distance=Distance.COSINE),
-            )
+        # How columns were resolved: by "name", by "value" signature, as
+        # "new" without the LLM, by the "llm", through another column of the
+        # same table ("cluster") or another call resolving the same name
+        # ("shared"), or by a feature another worker had just added ("raced")
+        self.match_stats = Counter()
+
+        # Names being resolved right now, by normalize_name, with the Future
+        # of their (was_added, name_to_use) result
+        self._inflight_lock = threading.Lock()
+        self._inflight = {}
+
+        self._catalog_lock = threading.Lock()
+        self._catalog = {}
+        self._catalog_version = None
     
     def load_vectors_in_batches(self, vectors, texts, batch_size=100):
         """
@@ -46,39 +109,108 @@ class Storage:
 
             self.load_vectors(embedded_data, data)
 
-    def load_vectors(self, vectors, texts):
+    def load_vectors(self, vectors, texts, value_vectors=None):
         """
         Upserts a batch of vectors and text payloads into the collection
 
         Generates a deterministic UUIDv5 for each point based on its text
-        content to ensure uniqueness
+        content to ensure uniqueness, and records the points in the local
+        catalog
 
         Args:
             vectors (list[np.ndarray]): A list of numpy array vectors
             texts (list[str]): A list of corresponding text payloads
+            value_vectors (list[np.ndarray], optional): Value signatures of
+                the features, stored under the same ids
         """
         namespace = uuid.NAMESPACE_DNS 
-        
-        self.client.upsert(
-            collection_name = self.collection_name,
-            points=[
-                PointStruct(
-                        id=str(uuid.uuid5(namespace, texts[idx])), 
-                        vector=vector.tolist(),
-                        payload={"col": texts[idx]}
-                )
-                for idx, vector in enumerate(vectors)
-            ],
-            wait=True
+        seq = time.time_ns()
+        ids = [str(uuid.uuid5(namespace, text)) for text in texts]
+        payloads = [{"col": text, "seq": seq} for text in texts]
+
+        values_backend = None
+        if value_vectors is not None and len(value_vectors):
+            values_backend = self._values(len(value_vectors[0]))
+        if values_backend is not None:
+            values_backend.upsert(ids, value_vectors, payloads)
+            # Tells the matcher a value score is missing because the
+            # values differ, not because the feature has no signature
+            payloads = [{**payload, "values": True} for payload in payloads]
+
+        self.backend.upsert(ids, vectors, payloads)
+
+        with self._catalog_lock:
+            self._catalog.update(zip(ids, texts))
+
+    def load_vectors_bulk(self, vectors, texts, batch_size=256, parallel=1, wait=False,
+                          value_vectors=None):
+        """
+        Bulk-loads many vectors, e.g. to seed or reindex the feature catalog
+
+        The vectors go to the backend as one contiguous float32 array (no
+        copy if they already are one), without per-point Python objects.
+        With `wait` False the backend only acknowledges batches as received
+        and makes all points visible with one final barrier before returning,
+        where a single barrier covers the load (see the backend's `upload`)
+
+        Args:
+            vectors (np.ndarray): A 2D array with one vector per text
+            texts (list[str]): A list of corresponding text payloads
+            batch_size (int, optional): The number of points per request.
+                                        Defaults to 256
+            parallel (int, optional): The number of concurrent uploaders
+                                      (Qdrant). Defaults to 1
+            wait (bool, optional): Whether every batch waits until it is
+                                   applied. Defaults to False
+            value_vectors (np.ndarray, optional): Value signatures of the
+                features, stored under the same ids. Defaults to None
+
+        Returns:
+            dict: "points", "seconds" and "points_per_second" of the load
+        """
+        start = time.perf_counter()
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        seq = time.time_ns()
+        ids = [str(uuid.uuid5(uuid.NAMESPACE_DNS, text)) for text in texts]
+        payloads = [{"col": text, "seq": seq} for text in texts]
+
+        values_backend = None
+        if value_vectors is not None and len(value_vectors):
+            value_vectors = np.ascontiguousarray(value_vectors, dtype=np.float32)
+            values_backend = self._values(value_vectors.shape[1])
+        if values_backend is not None:
+            values_backend.upload(
+                ids, value_vectors, payloads,
+                batch_size=batch_size, parallel=parallel, wait=wait,
+            )
+            payloads = [{**payload, "values": True} for payload in payloads]
+
+        self.backend.upload(
+            ids, vectors, payloads,
+            batch_size=batch_size, parallel=parallel, wait=wait,
         )
 
-    def smart_load(self, vector, text, feature_values, threshold=0.8):
+        with self._catalog_lock:
+            self._catalog.update(zip(ids, texts))
+
+        seconds = time.perf_counter() - start
+        return {
+            "points": len(ids),
+            "seconds": seconds,
+            "points_per_second": len(ids) / seconds if seconds > 0 else float("inf"),
+        }
+
+    def smart_load(self, vector, text, feature_values, threshold=0.8,
+                   candidate_k=None, candidate_floor=0.0, value_vector=None):
         """
         Intelligently loads a single vector, checking for duplicates first
 
         1. Searches for the most similar existing vector
         2. If a similar vector (score > threshold) is found, it returns (False, existing_name)
-        3. If unique, it consults an LLM (map_feature) to map the new text
+        3. If unique, it consults an LLM (map_feature) to map the new text.
+           With `candidate_k` set, the LLM only sees the top-k nearest
+           features scoring at least `candidate_floor` instead of the whole
+           catalog; if there is no such candidate, the text is new
         4. If the LLM identifies it as new ("NAN"), the vector is loaded and
            it returns (True, new_name)
         5. If the LLM maps it to an existing feature, it returns (False, mapped_name)
@@ -86,10 +218,17 @@ class Storage:
         Args:
             vector (np.ndarray): The single vector to check
             text (str): The corresponding text (e.g., column name)
-            feature_values (list): A list of sample values from the column
+            feature_values (list | dict): Sample values from the column or its
+                                          `profile_column` signature
             threshold (float, optional): The cosine similarity threshold for
                                          considering a vector a duplicate.
                                          Defaults to 0.8.
+            candidate_k (int, optional): How many nearest features to offer
+                                         the LLM. Defaults to None (all)
+            candidate_floor (float, optional): Minimum score of an offered
+                                               candidate. Defaults to 0.0
+            value_vector (np.ndarray, optional): Value signature of the
+                column, stored with it if it is added. Defaults to None
 
         Returns:
             tuple[bool, str]: A tuple of (was_added, name_to_use)
@@ -97,23 +236,415 @@ class Storage:
                               - (False, existing_name) if a duplicate was found
                               - (False, mapped_name) if the LLM mapped it
         """
-        hits = self.client.search(
-            collection_name=self.collection_name,
-            query_vector=vector.tolist(),
-            limit=1
-        )
+        hits = self.search_similarities(vector, limit=max(1, candidate_k or 1))
 
         if hits and hits[0].score > threshold:
             existing_name = hits[0].payload.get("col", "Unknown")
             return False, existing_name
         else:
-            llm_res = map_feature(text, feature_values, self.list_data())
+            llm_res = self._map_feature(text, feature_values, hits, candidate_k, candidate_floor)
             if llm_res == "NAN":
-                self.load_vectors_in_batches([vector], [text])
-                return True, text
+                return self._add_new(
+                    [vector], [text], None if value_vector is None else [value_vector], threshold,
+                )[0]
             
             return False, llm_res
 
+    def smart_load_batch(self, vectors, texts, features_values, threshold=0.8,
+                         candidate_k=None, candidate_floor=0.0, value_vectors=None,
+                         name_weight=NAME_WEIGHT, accept_score=ACCEPT_SCORE,
+                         accept_margin=ACCEPT_MARGIN, new_below=NEW_BELOW_SCORE):
+        """
+        Batched counterpart of `smart_load` for all columns of one table
+
+        Before any lookup, the columns are grouped locally: a column whose
+        normalized name equals that of an earlier column of the table is
+        resolved once with it.
+        A name that another call is already resolving (single flight, keyed
+        by `normalize_name`) waits for that result instead of a second
+        lookup and LLM request. Each remaining column then goes through:
+
+        1. Resolves the nearest neighbours of every vector with a single
+           `search_batch` request instead of one `search` per column
+        2. With `value_vectors`, columns that miss the name threshold are
+           scored against the nearest features by name and by value
+           signature: combined = name_weight * name + (1 - name_weight) * value.
+           The best feature is accepted without the LLM if both searches
+           found it and it reaches `accept_score` with a lead of
+           `accept_margin` over what any other feature could score, and the
+           column is new without the LLM if no feature could reach
+           `new_below`. Only the ambiguous columns in between go on, with
+           the features ranked by combined score as candidates
+        3. Maps all remaining columns with a single LLM request
+           (map_features), using the same candidate rules as `smart_load`
+        4. Loads the columns the LLM reports as new ("NAN") under the lock
+           of the collection, unless another worker added a feature above
+           the threshold meanwhile, or an earlier new column of the table
+           is above the threshold, in which case it reuses that feature
+
+        Args:
+            vectors (np.ndarray): A 2D array with one vector per column
+            texts (list[str]): The corresponding texts (e.g., column names)
+            features_values (list): Sample values or signature of each column
+            threshold (float, optional): The cosine similarity threshold for
+                                         considering a vector a duplicate.
+                                         Defaults to 0.8.
+            candidate_k (int, optional): How many nearest features to offer
+                                         the LLM. Defaults to None (all)
+            candidate_floor (float, optional): Minimum score of an offered
+                                               candidate. Defaults to 0.0
+            value_vectors (np.ndarray | callable, optional): Value signature
+                of each column (see `column_profile.value_signatures`), or a
+                function returning the signatures of the columns at a list
+                of indices, which is only called for the columns the name
+                search leaves unresolved. Defaults to None (names only)
+            name_weight (float, optional): Weight of the name score in the
+                                           combined score. Defaults to NAME_WEIGHT
+            accept_score (float, optional): Combined score needed to match
+                                            without the LLM. Defaults to ACCEPT_SCORE
+            accept_margin (float, optional): Lead over the runner-up needed to
+                                             match without the LLM. Defaults
+                                             to ACCEPT_MARGIN
+            new_below (float, optional): Combined score below which a column
+                                         is new without the LLM. Defaults to
+                                         NEW_BELOW_SCORE
+
+        Returns:
+            list[tuple[bool, str]]: One (was_added, name_to_use) tuple per
+                                    text, with the same meaning as in
+                                    `smart_load`. Columns grouped with an
+                                    earlier one get (False, its name)
+        """
+        if len(texts) == 0:
+            return []
+
+        if value_vectors is not None and not callable(value_vectors):
+            signatures = value_vectors
+            value_vectors = lambda indices: [signatures[i] for i in indices]
+
+        leaders = self._cluster(texts)
+        grouped = sum(idx != leader for idx, leader in enumerate(leaders))
+        if grouped:
+            self.match_stats["cluster"] += grouped
+
+        resolving = {}
+        waiting = {}
+        with self._inflight_lock:
+            for idx in sorted(set(leaders)):
+                key = normalize_name(texts[idx])
+                future = self._inflight.get(key)
+                if future is None:
+                    resolving[idx] = (key, self._inflight.setdefault(key, Future()))
+                else:
+                    waiting[idx] = future
+
+        def resolve(indices):
+            return dict(zip(indices, self._resolve_batch(
+                [vectors[i] for i in indices],
+                [texts[i] for i in indices],
+                [features_values[i] for i in indices],
+                None if value_vectors is None else (
+                    lambda positions: value_vectors([indices[p] for p in positions])
+                ),
+                threshold, candidate_k, candidate_floor,
+                name_weight, accept_score, accept_margin, new_below,
+            )))
+
+        resolved = {}
+        try:
+            if resolving:
+                resolved.update(resolve(list(resolving)))
+        finally:
+            # Waiters of a failed resolution get None and resolve themselves
+            with self._inflight_lock:
+                for idx, (key, future) in resolving.items():
+                    del self._inflight[key]
+                    future.set_result(resolved.get(idx))
+
+        retry = []
+        for idx, future in waiting.items():
+            result = future.result()
+            if result is None:
+                retry.append(idx)
+            else:
+                resolved[idx] = (False, result[1])
+                self.match_stats["shared"] += 1
+        if retry:
+            resolved.update(resolve(retry))
+
+        return [
+            resolved[leader] if idx == leader else (False, resolved[leader][1])
+            for idx, leader in enumerate(leaders)
+        ]
+
+    def _resolve_batch(self, vectors, texts, features_values, value_vectors, threshold,
+                       candidate_k, candidate_floor, name_weight, accept_score,
+                       accept_margin, new_below):
+        """
+        Resolves distinct columns against the catalog, steps 1-4 of
+        `smart_load_batch`
+        """
+        limit = max(1, candidate_k or 1)
+        if value_vectors is not None:
+            limit = max(limit, SIGNATURE_CANDIDATES)
+        batch_hits = self.search_batch(vectors, limit=limit)
+
+        # Signatures are only computed and searched for the columns the name
+        # search leaves unresolved
+        signatures = {}
+        value_hits = {}
+        unresolved = [
+            idx for idx, hits in enumerate(batch_hits)
+            if not (hits and hits[0].score > threshold)
+        ]
+        if value_vectors is not None and unresolved:
+            computed = value_vectors(unresolved)
+            values_backend = self._values(len(computed[0]))
+            if values_backend is not None:
+                signatures = dict(zip(unresolved, computed))
+                value_hits = dict(zip(unresolved, values_backend.search_batch(computed, SIGNATURE_CANDIDATES)))
+
+        results = [None] * len(texts)
+        targets = {}
+        candidates = {}
+
+        for idx, (text, feature_values, hits) in enumerate(zip(texts, features_values, batch_hits)):
+            if hits and hits[0].score > threshold:
+                results[idx] = (False, hits[0].payload.get("col", "Unknown"))
+                self.match_stats["name"] += 1
+                continue
+
+            # Catalogs without value signatures yet keep name-only matching
+            if value_hits.get(idx):
+                hits = self._combined_hits(hits, value_hits[idx], name_weight)
+                if hits:
+                    # Only a feature both searches found can be accepted, by a
+                    # lead over the most any other feature could score
+                    best = hits[0]
+                    runner_up = max((hit.payload["upper"] for hit in hits[1:]), default=0.0)
+                    if (best.payload["measured"] and best.score >= accept_score
+                            and best.score - runner_up >= accept_margin):
+                        results[idx] = (False, best.payload.get("col", "Unknown"))
+                        self.match_stats["value"] += 1
+                        continue
+                if not hits or max(hit.payload["upper"] for hit in hits) < new_below:
+                    # Neither the name nor the values resemble a known feature
+                    self.match_stats["new"] += 1
+                    continue
+
+            text_candidates = self._candidates(hits, candidate_k, candidate_floor)
+            # Nothing close enough to map to, so the LLM could only answer NAN
+            if text_candidates == []:
+                continue
+            targets[text] = feature_values
+            self.match_stats["llm"] += 1
+            if text_candidates is not None:
+                candidates[text] = text_candidates
+
+        llm_results = {}
+        if targets:
+            if candidate_k is None:
+                llm_results = map_features(targets, self.list_data())
+            else:
+                llm_results = map_features(targets, [], candidates)
+
+        new = []
+        for idx, text in enumerate(texts):
+            if results[idx] is not None:
+                continue
+
+            llm_res = llm_results.get(text, "NAN")
+            if llm_res != "NAN":
+                results[idx] = (False, llm_res)
+            else:
+                new.append(idx)
+
+        if new:
+            added = self._add_new(
+                [vectors[i] for i in new], [texts[i] for i in new],
+                [signatures[i] for i in new] if signatures else None,
+                threshold,
+            )
+            for idx, result in zip(new, added):
+                results[idx] = result
+
+        return results
+
+    @staticmethod
+    def _cluster(texts):
+        """
+        Groups the duplicate columns of one table
+
+        A column joins the group of the first earlier column with the same
+        normalized name. Merely similar names are only grouped if both turn
+        out to be new, by their embeddings (see `_add_new`)
+
+        Returns:
+            list[int]: The index of each column's group leader (the first
+                       column of the group; itself for leaders)
+        """
+        leaders = []
+        by_key = {}
+        for idx, text in enumerate(texts):
+            leaders.append(by_key.setdefault(normalize_name(text), idx))
+        return leaders
+
+    def _add_new(self, vectors, texts, value_vectors, threshold):
+        """
+        Adds features the catalog doesn't have, race-free across workers
+
+        Under the lock of the collection, the texts are searched again: a
+        feature above the threshold that another worker added since the
+        first lookup is reused instead of adding a near-duplicate. Likewise,
+        a text above the threshold of one added earlier in the same call
+        (e.g. "studentID" and "student id" of one table) reuses that text
+
+        Returns:
+            list[tuple[bool, str]]: (True, text) for added texts,
+                                    (False, existing_name) for reused ones
+        """
+        with self.backend.lock():
+            results = []
+            keep = []
+            # Unit vectors of the texts added so far, for cosine similarity
+            added = []
+            for idx, hits in enumerate(self.search_batch(vectors, limit=1)):
+                if hits and hits[0].score > threshold:
+                    results.append((False, hits[0].payload.get("col", "Unknown")))
+                    self.match_stats["raced"] += 1
+                    continue
+
+                unit = np.asarray(vectors[idx], dtype=np.float32)
+                unit = unit / (np.linalg.norm(unit) or 1.0)
+                scores = [float(other @ unit) for other in added]
+                if scores and max(scores) > threshold:
+                    results.append((False, texts[keep[int(np.argmax(scores))]]))
+                    self.match_stats["cluster"] += 1
+                else:
+                    results.append((True, texts[idx]))
+                    keep.append(idx)
+                    added.append(unit)
+
+            if keep:
+                self.load_vectors(
+                    [vectors[i] for i in keep], [texts[i] for i in keep],
+                    None if value_vectors is None else [value_vectors[i] for i in keep],
+                )
+        return results
+
+    def _values(self, dim):
+        """
+        Returns the index of value signatures, opening the "<name>-values"
+        collection of the same backend kind on first use, or None if value
+        matching is unavailable
+        """
+        if self.values_backend is None and self._backend_cls is not None:
+            with self._catalog_lock:
+                if self.values_backend is None:
+                    self.values_backend = self._backend_cls(f"{self.collection_name}-values", dim)
+        return self.values_backend
+
+    @staticmethod
+    def _combined_hits(name_hits, value_hits, name_weight):
+        """
+        Merges the name and value neighbours of a column into hits scored by
+        name_weight * name + (1 - name_weight) * value, best first
+
+        A feature found by only one of the searches has a missing score. The
+        hit's score takes it as 0 (a lower bound), and its payload's "upper"
+        as the lowest score the other search returned (an upper bound, since
+        the feature was not among those hits), or as 1 for a feature stored
+        without a value signature, whose value score is unknown. "measured"
+        tells whether both scores are known
+        """
+        name_scores = {str(hit.id): hit.score for hit in name_hits}
+        value_scores = {str(hit.id): hit.score for hit in value_hits}
+        name_floor = min(name_scores.values(), default=0.0)
+        value_floor = min(value_scores.values(), default=0.0)
+
+        names = {}
+        for hit in (*name_hits, *value_hits):
+            names.setdefault(str(hit.id), hit.payload.get("col"))
+        # Features of the name search stored without a value signature
+        unsigned = {str(hit.id) for hit in name_hits if not hit.payload.get("values")}
+
+        combined = []
+        for point_id, name in names.items():
+            name_score = name_scores.get(point_id)
+            value_score = value_scores.get(point_id)
+            combined.append(Point(point_id, {
+                "col": name,
+                "measured": name_score is not None and value_score is not None,
+                "upper": (
+                    name_weight * (name_floor if name_score is None else name_score)
+                    + (1 - name_weight) * (
+                        value_score if value_score is not None
+                        else 1.0 if point_id in unsigned else value_floor
+                    )
+                ),
+            }, score=name_weight * (name_score or 0.0) + (1 - name_weight) * (value_score or 0.0)))
+        combined.sort(key=lambda hit: hit.score, reverse=True)
+        return combined
+
+    def _candidates(self, hits, candidate_k, candidate_floor):
+        """
+        Picks the features offered to the LLM for an unresolved text
+
+        Returns:
+            list[str] | None: The names of the top `candidate_k` hits scoring
+                              at least `candidate_floor`, or None when
+                              `candidate_k` is None and the LLM should see the
+                              whole catalog
+        """
+        if candidate_k is None:
+            return None
+
+        candidates = []
+        for hit in hits:
+            name = hit.payload.get("col")
+            # Combined hits with a missing score are offered if they could reach the floor
+            score = hit.payload.get("upper", hit.score)
+            if score >= candidate_floor and name not in candidates:
+                candidates.append(name)
+        return candidates[:candidate_k]
+
+    def _map_feature(self, text, feature_values, hits, candidate_k, candidate_floor):
+        """
+        Asks the LLM to map an unresolved text to a known feature
+
+        Without `candidate_k` the LLM sees the whole catalog. Otherwise it
+        only sees the top-k hits that score at least `candidate_floor`,
+        which keeps the prompt size constant as the catalog grows
+
+        Returns:
+            str: The mapped feature name or "NAN"
+        """
+        candidates = self._candidates(hits, candidate_k, candidate_floor)
+        if candidates is None:
+            return map_feature(text, feature_values, self.list_data())
+
+        # Nothing close enough to map to, so the LLM could only answer NAN
+        if not candidates:
+            return "NAN"
+
+        return map_feature(text, feature_values, candidates)
+
+    def search_batch(self, query_vectors, limit):
+        """
+        Searches the collection for the neighbours of many vectors at once
+
+        All queries go to the backend at once: a single `search_batch`
+        request for Qdrant, a single matrix multiply for the numpy index
+
+        Args:
+            query_vectors (np.ndarray): A 2D array with one query per row
+            limit (int): The maximum number of similar points per query
+
+        Returns:
+            list[list[ScoredPoint]]: The hits of each query, in query order
+        """
+        return self.backend.search_batch(query_vectors, limit)
+
     def search_similarities(self, query_vector, limit):
         """
         Searches the collection for vectors similar to the query vector
@@ -125,12 +656,7 @@ class Storage:
         Returns:
             list[ScoredPoint]: A list of search results (hits)
         """
-        hits = self.client.search(
-            collection_name=self.collection_name,
-            query_vector=query_vector.tolist(),
-            limit=limit
-        )
-        return hits
+        return self.backend.search(query_vector, limit)
     
     def my_size(self):
         """
@@ -139,10 +665,7 @@ class Storage:
         Returns:
             int: The total number of points
         """
-        return self.client.count(
-            collection_name=self.collection_name, 
-            exact=True
-        )
+        return self.backend.count()
 
     def my_info(self,):
         """
@@ -151,9 +674,7 @@ class Storage:
         Returns:
             CollectionInfo: An object containing collection details
         """
-        return self.client.get_collection(
-            collection_name=self.collection_name
-        )
+        return self.backend.info()
     
     def get_all_vectors(self, page_size=100):
         """
@@ -168,42 +689,52 @@ class Storage:
         Returns:
             list[Record]: A list of all points in the collection
         """
-        all_points = []
-        offset = None
-
-        while True:
-            points, next_page_offset = self.client.scroll(
-                collection_name=self.collection_name,
-                limit=page_size,
-                with_payload=True,
-                with_vectors=True,
-                offset=offset
-            )
-            
-            all_points.extend(points)
-            
-            if next_page_offset is None:
-                break
-            
-            offset = next_page_offset
-            
-        return all_points
+        return list(self.backend.scroll(with_vectors=True, page_size=page_size))
     
+    def refresh_catalog(self, page_size=1000):
+        """
+        Brings the local feature catalog up to date with the collection
+
+        The first call scrolls all payloads once. Later calls only scroll
+        points whose "seq" is newer than the last known version (minus
+        CATALOG_SKEW_NS), so a refresh costs O(new points). Vectors are
+        never transferred
+
+        Args:
+            page_size (int, optional): How many points to retrieve per request
+                                     Defaults to 1000
+
+        Returns:
+            int: The number of points received from the collection
+        """
+        with self._catalog_lock:
+            min_seq = None
+            if self._catalog_version is not None:
+                min_seq = self._catalog_version - CATALOG_SKEW_NS
+
+            received = 0
+            version = self._catalog_version or 0
+
+            for point in self.backend.scroll(min_seq=min_seq, page_size=page_size, fields=["col", "seq"]):
+                self._catalog[str(point.id)] = point.payload.get("col")
+                version = max(version, point.payload.get("seq") or 0)
+                received += 1
+
+            self._catalog_version = version
+            return received
+
     def list_data(self):
         """
         Gets a simple list of all text payloads stored in the collection
 
-        This is a helper function that calls `get_all_vectors` and extracts
-        the "col" payload from each point
+        Served from the local catalog after an incremental refresh, so the
+        cost does not grow with the number of stored features
 
         Returns:
             list[str]: A list of all stored "col" text values
         """
-        ret = []
-        all_stored_data = self.get_all_vectors()
-
-        for point in all_stored_data:
-            ret.append(point.payload.get("col"))
+        self.refresh_catalog()
 
-        return ret
+        with self._catalog_lock:
+            return list(self._catalog.values())
 
@@ -1,18 +1,41 @@
-import tempfile
 import ffmpeg
+import hashlib
 import json
+import multiprocessing
 import os
-from vosk import Model, KaldiRecognizer
-from agent import call_agent, prompt
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from vosk import KaldiRecognizer
+from summarizer import summarize
+from resources import get_vosk_model
+from result_cache import file_digest
 
 
 VOSK_MODEL_PATH = "vosk-model-small-cs-0.4-rhasspy"
-model = Model(VOSK_MODEL_PATH)
+SAMPLE_RATE = 16000
+# Bytes of 16-bit mono PCM passed to Vosk per AcceptWaveform call
+CHUNK_SIZE = 4000
 
+# Segment-parallel transcription: number of worker processes (1 disables it),
+# window length and the context decoded on each side of a window, in seconds
+SEGMENT_WORKERS = int(os.getenv("DQ_SEGMENT_WORKERS", "1"))
+SEGMENT_SECONDS = 300.0
+SEGMENT_OVERLAP_SECONDS = 2.0
+# Where unfinished segmented transcriptions keep their per-segment checkpoints
+CHECKPOINT_DIR = os.getenv(
+    "DQ_TRANSCRIPT_CHECKPOINTS",
+    os.path.join(os.path.expanduser("~"), ".cache", "dq", "transcript_checkpoints"),
+)
 
-def convert_to_wav(input_path: str, sample_rate: int = 16000) -> str:
+
+def stream_pcm(input_path: str, sample_rate: int = SAMPLE_RATE, chunk_size: int = CHUNK_SIZE,
+               start: float = None, duration: float = None):
     """
-    Convert an input audio file to a temporary WAV file.
+    Decode an audio file with ffmpeg and yield raw 16-bit mono PCM chunks.
+
+    ffmpeg writes to a pipe in a separate process, so decoding overlaps with
+    whatever the consumer does with each chunk, and nothing is written to disk.
 
     Parameters
     ----------
@@ -20,68 +43,258 @@ def convert_to_wav(input_path: str, sample_rate: int = 16000) -> str:
         Path to the original audio file.
     sample_rate : int
         Target sample rate for Vosk processing.
+    chunk_size : int
+        Number of bytes per yielded chunk.
+    start : float, optional
+        Offset in seconds to start decoding from.
+    duration : float, optional
+        Number of seconds to decode.
 
-    Returns
-    -------
-    str
-        Path to the generated temporary WAV file.
+    Yields
+    ------
+    bytes
+        PCM data (the last chunk may be shorter).
     """
-    fd, tmp_wav_path = tempfile.mkstemp(suffix=".wav")
-    os.close(fd)
+    input_args = {}
+    if start is not None:
+        input_args["ss"] = start
+    if duration is not None:
+        input_args["t"] = duration
 
-    # Convert using ffmpeg with mono channel and target sample rate
-    (
+    process = (
         ffmpeg
-        .input(input_path)
-        .output(tmp_wav_path, ac=1, ar=sample_rate, format="wav")
-        .overwrite_output()
-        .run(quiet=True)
+        .input(input_path, **input_args)
+        .output("pipe:", format="s16le", acodec="pcm_s16le", ac=1, ar=sample_rate)
+        .global_args("-loglevel", "error")
+        .run_async(pipe_stdout=True, pipe_stderr=True)
     )
-    return tmp_wav_path
+
+    # stderr is drained concurrently: ffmpeg blocks once a pipe buffer of
+    # warnings is unread, and stdout would then never reach EOF
+    stderr = []
+    drain = threading.Thread(target=lambda: stderr.append(process.stderr.read()), daemon=True)
+    drain.start()
+
+    try:
+        while True:
+            data = process.stdout.read(chunk_size)
+            if not data:
+                break
+            yield data
+
+        returncode = process.wait()
+        drain.join()
+        if returncode != 0:
+            message = b"".join(stderr).decode(errors="replace").strip()
+            raise RuntimeError(f"ffmpeg decoding failed: {message}")
+    finally:
+        # Stop ffmpeg if the consumer stopped early
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        drain.join()
+        process.stdout.close()
+        process.stderr.close()
 
 
-def transcribe_audio(path: str) -> str:
+def transcribe_audio(path: str, chunk_size: int = CHUNK_SIZE) -> str:
     """
     Transcribe an audio file using the Vosk model.
 
+    Decoded PCM is streamed from ffmpeg straight into the recognizer, without
+    a temporary WAV file.
+
     Parameters
     ----------
     path : str
         Path to the audio file to transcribe.
+    chunk_size : int
+        Number of PCM bytes passed to the recognizer at a time.
 
     Returns
     -------
     str
         Raw transcript text extracted by Vosk.
     """
-    wav_path = convert_to_wav(path)
+    rec = KaldiRecognizer(get_vosk_model(VOSK_MODEL_PATH), SAMPLE_RATE)
+    rec.SetWords(True)
 
-    try:
-        rec = KaldiRecognizer(model, 16000)
-        rec.SetWords(True)
+    transcript_chunks = []
 
-        transcript_chunks = []
+    # Stream decoded PCM to Vosk in chunks
+    for data in stream_pcm(path, SAMPLE_RATE, chunk_size):
+        if rec.AcceptWaveform(data):
+            res = json.loads(rec.Result())
+            transcript_chunks.append(res.get("text", ""))
 
-        # Stream WAV file to Vosk in chunks
-        with open(wav_path, "rb") as wf:
-            while True:
-                data = wf.read(4000)
-                if not data:
-                    break
-                if rec.AcceptWaveform(data):
-                    res = json.loads(rec.Result())
-                    transcript_chunks.append(res.get("text", ""))
+    # Include final recognition output
+    final_res = json.loads(rec.FinalResult())
+    transcript_chunks.append(final_res.get("text", ""))
 
-            # Include final recognition output
-            final_res = json.loads(rec.FinalResult())
-            transcript_chunks.append(final_res.get("text", ""))
+    return " ".join(transcript_chunks).strip()
 
-        return " ".join(transcript_chunks).strip()
 
-    finally:
-        # Cleanup temporary WAV file
-        if os.path.exists(wav_path):
-            os.remove(wav_path)
+def plan_segments(total_seconds: float, segment_seconds: float = SEGMENT_SECONDS,
+                  overlap_seconds: float = SEGMENT_OVERLAP_SECONDS) -> list[dict]:
+    """
+    Split a recording into fixed windows, each decoded with overlapping context.
+
+    Parameters
+    ----------
+    total_seconds : float
+        Length of the recording.
+    segment_seconds : float
+        Length of each window.
+    overlap_seconds : float
+        Extra audio decoded on each side of a window, so words crossing a
+        window border are recognized in full by one of the two segments.
+
+    Returns
+    -------
+    list[dict]
+        Segments with their own window (`start`, `end`) and decoded range
+        (`decode_start`, `decode_end`), in order.
+    """
+    segments = []
+    start = 0.0
+    while start < total_seconds:
+        end = min(start + segment_seconds, total_seconds)
+        segments.append({
+            "index": len(segments),
+            "start": start,
+            "end": end,
+            "decode_start": max(0.0, start - overlap_seconds),
+            "decode_end": min(total_seconds, end + overlap_seconds),
+        })
+        start = end
+    return segments
+
+
+def transcribe_segment(path: str, segment: dict, chunk_size: int = CHUNK_SIZE) -> list[str]:
+    """
+    Transcribe one segment of a recording.
+
+    Runs in a worker process that holds its own loaded Vosk model. Only words
+    whose midpoint falls inside the segment's own window are kept, so
+    overlapping context is not transcribed twice.
+
+    Parameters
+    ----------
+    path : str
+        Path to the audio file.
+    segment : dict
+        One entry of `plan_segments`.
+    chunk_size : int
+        Number of PCM bytes passed to the recognizer at a time.
+
+    Returns
+    -------
+    list[str]
+        Recognized words of the segment, in order.
+    """
+    rec = KaldiRecognizer(get_vosk_model(VOSK_MODEL_PATH), SAMPLE_RATE)
+    rec.SetWords(True)
+
+    results = []
+    pcm = stream_pcm(
+        path, SAMPLE_RATE, chunk_size,
+        start=segment["decode_start"],
+        duration=segment["decode_end"] - segment["decode_start"],
+    )
+    for data in pcm:
+        if rec.AcceptWaveform(data):
+            results.append(json.loads(rec.Result()))
+    results.append(json.loads(rec.FinalResult()))
+
+    words = []
+    for res in results:
+        for word in res.get("result", []):
+            midpoint = segment["decode_start"] + (word["start"] + word["end"]) / 2
+            if segment["start"] <= midpoint < segment["end"]:
+                words.append(word["word"])
+    return words
+
+
+def transcribe_audio_segmented(path: str, workers: int = SEGMENT_WORKERS,
+                               segment_seconds: float = SEGMENT_SECONDS,
+                               overlap_seconds: float = SEGMENT_OVERLAP_SECONDS,
+                               checkpoint_dir: str = CHECKPOINT_DIR) -> str:
+    """
+    Transcribe a long recording by recognizing segments in parallel processes.
+
+    Each finished segment is checkpointed to disk, so a crashed run resumes
+    with the missing segments only. Checkpoints are removed once the full
+    transcript has been stitched together.
+
+    Parameters
+    ----------
+    path : str
+        Path to the audio file.
+    workers : int
+        Number of worker processes, each loading its own Vosk model.
+    segment_seconds : float
+        Length of each segment.
+    overlap_seconds : float
+        Context decoded on each side of a segment.
+    checkpoint_dir : str
+        Root directory of the per-recording checkpoints.
+
+    Returns
+    -------
+    str
+        Raw transcript text extracted by Vosk.
+    """
+    total_seconds = float(ffmpeg.probe(path)["format"]["duration"])
+    segments = plan_segments(total_seconds, segment_seconds, overlap_seconds)
+    if len(segments) <= 1 or workers <= 1:
+        return transcribe_audio(path)
+
+    # Checkpoints belong to this exact audio content and segmentation
+    run_key = hashlib.sha256(
+        f"{file_digest(path)}:{VOSK_MODEL_PATH}:{segment_seconds}:{overlap_seconds}".encode()
+    ).hexdigest()
+    run_dir = os.path.join(checkpoint_dir, run_key)
+    os.makedirs(run_dir, exist_ok=True)
+
+    words = {}
+    pending = []
+    for segment in segments:
+        checkpoint = os.path.join(run_dir, f"{segment['index']:06d}.json")
+        try:
+            with open(checkpoint, "r", encoding="utf-8") as f:
+                words[segment["index"]] = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            pending.append(segment)
+
+    if pending:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(pending)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=get_vosk_model,
+            initargs=(VOSK_MODEL_PATH,),
+        ) as pool:
+            futures = {pool.submit(transcribe_segment, path, segment): segment for segment in pending}
+            error = None
+            for future in as_completed(futures):
+                segment = futures[future]
+                # Keep checkpointing the other segments when one fails
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                words[segment["index"]] = future.result()
+
+                # Write atomically so a crash never leaves a partial checkpoint
+                checkpoint = os.path.join(run_dir, f"{segment['index']:06d}.json")
+                with open(checkpoint + ".tmp", "w", encoding="utf-8") as f:
+                    json.dump(words[segment["index"]], f, ensure_ascii=False)
+                os.replace(checkpoint + ".tmp", checkpoint)
+
+            if error is not None:
+                raise error
+
+    transcript = " ".join(" ".join(words[segment["index"]]) for segment in segments)
+    shutil.rmtree(run_dir, ignore_errors=True)
+    return " ".join(transcript.split())
 
 
 def clean_czech_text(text: str) -> str:
@@ -101,12 +314,35 @@ def clean_czech_text(text: str) -> str:
     return text.replace("[unk]", "").strip()
 
 
+def transform_to_transcript(path: str) -> str:
+    """
+    Transcribe an audio recording with Vosk and clean transcription artifacts.
+
+    Long recordings are transcribed segment-parallel when `SEGMENT_WORKERS`
+    (DQ_SEGMENT_WORKERS) is greater than 1.
+
+    Parameters
+    ----------
+    path : str
+        Path to the input audio file.
+
+    Returns
+    -------
+    str
+        Cleaned transcript.
+    """
+    if SEGMENT_WORKERS > 1:
+        return clean_czech_text(transcribe_audio_segmented(path, SEGMENT_WORKERS))
+    return clean_czech_text(transcribe_audio(path))
+
+
 def transform_to_summary(path: str):
     """
     Convert an audio recording into a structured summary by:
     1. Transcribing audio with Vosk
     2. Cleaning transcription artifacts
-    3. Sending the cleaned text to the Llama model for summarization
+    3. Summarizing the cleaned text with the Llama model, in chunks for
+       long recordings
 
     Parameters
     ----------
@@ -118,7 +354,6 @@ def transform_to_summary(path: str):
     str
         Summary produced by the language model.
     """
-    transcript = transcribe_audio(path)
-    cleaned = clean_czech_text(transcript)
-    summary = call_agent(prompt, cleaned)
+    cleaned = transform_to_transcript(path)
+    summary = summarize(cleaned)
     return summary
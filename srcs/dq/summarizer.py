@@ -0,0 +1,235 @@
+import asyncio
+import hashlib
+import math
+
+from agent import call_agent_async, prompt, MODEL
+from llm_client import run_sync, submit
+
+# Rough characters-per-token ratio used to budget chunks without a tokenizer
+CHARS_PER_TOKEN = 4
+# Default token budget of one chunk sent to the model
+CHUNK_TOKENS = 3000
+# Default number of partial summaries merged by one reduce call
+FAN_IN = 8
+
+# Boundaries tried in order when a piece of text is too large: pages
+# (form feed, as emitted by the PDF handler), paragraphs, lines, sentences, words
+_SEPARATORS = ("\f", "\n\n", "\n", ". ", " ")
+
+# Prompt for summarizing one chunk of a longer document
+chunk_prompt = """
+<prompt>
+  <role>
+    You are an analytical assistant specializing in education policy and school systems.
+  </role>
+  <task>
+    You receive one part of a longer document. Extract all information related to schools, schooling, and the education system in this part, including reforms, trends, policies, funding changes, quality indicators, and learning outcomes, and whether each change is an improvement or a deterioration and for which groups.
+  </task>
+  <output_requirements>
+    Write a dense factual summary of at most 10 sentences in plain text. Keep concrete facts, numbers and affected groups. If the part contains nothing related to education, output exactly: NONE.
+  </output_requirements>
+</prompt>
+"""
+
+# Prompt for merging several partial summaries into one intermediate summary
+reduce_prompt = """
+<prompt>
+  <role>
+    You are an analytical assistant specializing in education policy and school systems.
+  </role>
+  <task>
+    You receive consecutive partial summaries of one longer document. Merge them into a single summary that keeps all education-related changes, their direction (better or worse), the affected groups, and their key causes or consequences.
+  </task>
+  <output_requirements>
+    Write a dense factual summary of at most 10 sentences in plain text, without repeating facts.
+  </output_requirements>
+</prompt>
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of model tokens in a text.
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _split(text: str, max_chars: int, level: int) -> list[str]:
+    """
+    Split text into pieces of at most `max_chars`, preferring the coarsest boundary.
+    """
+    if len(text) <= max_chars:
+        return [text]
+    if level == len(_SEPARATORS):
+        return [text[i : i + max_chars] for i in range(0, len(text), max_chars)]
+
+    separator = _SEPARATORS[level]
+    pieces = []
+    current = ""
+    for part in text.split(separator):
+        candidate = part if not current else current + separator + part
+        if len(candidate) <= max_chars:
+            current = candidate
+            continue
+        if current:
+            pieces.append(current)
+        if len(part) <= max_chars:
+            current = part
+        else:
+            pieces.extend(_split(part, max_chars, level + 1))
+            current = ""
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_into_chunks(text: str, chunk_tokens: int = CHUNK_TOKENS) -> list[str]:
+    """
+    Split a document into token-budgeted chunks on page and paragraph boundaries.
+
+    Pages and paragraphs are packed greedily into chunks; only pieces larger
+    than the budget are split further on lines, sentences and words.
+
+    Parameters
+    ----------
+    text : str
+        Document text.
+    chunk_tokens : int
+        Maximum estimated tokens per chunk.
+
+    Returns
+    -------
+    list[str]
+        Non-empty chunks in document order.
+    """
+    pieces = _split(text, chunk_tokens * CHARS_PER_TOKEN, 0)
+    return [piece.strip() for piece in pieces if piece.strip()]
+
+
+async def summarize_async(text: str, system_prompt: str = prompt,
+                          chunk_tokens: int = CHUNK_TOKENS, fan_in: int = FAN_IN) -> str:
+    """
+    Summarize a document of any length with map-reduce over chunks.
+
+    Short documents are summarized with a single call. Longer ones are split
+    into chunks that are summarized concurrently (bounded by the LLM client's
+    concurrency limit); partial summaries are then merged in groups of
+    `fan_in` until they fit one final call with `system_prompt`.
+
+    Parameters
+    ----------
+    text : str
+        Document text.
+    system_prompt : str
+        Prompt of the final call, defining the required output.
+    chunk_tokens : int
+        Maximum estimated tokens per chunk.
+    fan_in : int
+        Number of partial summaries merged per reduce call (at least 2).
+
+    Returns
+    -------
+    str
+        The final summary.
+    """
+    chunks = split_into_chunks(text, chunk_tokens)
+    if len(chunks) <= 1:
+        return await call_agent_async(system_prompt, text)
+
+    partials = await asyncio.gather(*(call_agent_async(chunk_prompt, chunk) for chunk in chunks))
+    return await reduce_summaries_async(partials, system_prompt, fan_in)
+
+
+async def reduce_summaries_async(partials: list[str], system_prompt: str = prompt,
+                                 fan_in: int = FAN_IN) -> str:
+    """
+    Merge partial summaries hierarchically into the final summary.
+
+    Parameters
+    ----------
+    partials : list[str]
+        Partial summaries in document order.
+    system_prompt : str
+        Prompt of the final call, defining the required output.
+    fan_in : int
+        Number of partial summaries merged per reduce call (at least 2).
+
+    Returns
+    -------
+    str
+        The final summary.
+    """
+    fan_in = max(2, fan_in)
+    # The model may return None content; it counts as an empty summary
+    partials = [p or "" for p in partials]
+    partials = [p for p in partials if p.strip() and p.strip() != "NONE"] or ["NONE"]
+
+    while len(partials) > fan_in:
+        groups = [partials[i : i + fan_in] for i in range(0, len(partials), fan_in)]
+        merged = await asyncio.gather(
+            *(call_agent_async(reduce_prompt, "\n\n".join(group)) for group in groups)
+        )
+        partials = [p or "" for p in merged]
+
+    return await call_agent_async(system_prompt, "\n\n".join(partials)) or ""
+
+
+def summarize_pages(pages, system_prompt: str = prompt,
+                    chunk_tokens: int = CHUNK_TOKENS, fan_in: int = FAN_IN) -> str:
+    """
+    Summarize a document streamed page by page.
+
+    Pages are packed into chunks as they arrive, and every full chunk is sent
+    to the model right away, so summarization overlaps with extraction of
+    the remaining pages. Chunking and the reduce step match `summarize`.
+
+    Parameters
+    ----------
+    pages : Iterable[str]
+        Page texts in document order, e.g. `PDFTextHandler.iter_pages`.
+    system_prompt : str
+        Prompt of the final call, defining the required output.
+    chunk_tokens : int
+        Maximum estimated tokens per chunk.
+    fan_in : int
+        Number of partial summaries merged per reduce call (at least 2).
+
+    Returns
+    -------
+    str
+        The final summary.
+    """
+    futures = []
+    buffer = ""
+    for page in pages:
+        buffer = page if not buffer else buffer + "\n\f" + page
+        if estimate_tokens(buffer) > chunk_tokens:
+            # Everything but the last chunk is final; the last one may still grow
+            *ready, buffer = split_into_chunks(buffer, chunk_tokens) or [""]
+            futures.extend(submit(call_agent_async(chunk_prompt, chunk)) for chunk in ready)
+
+    chunks = split_into_chunks(buffer, chunk_tokens)
+    if not futures and len(chunks) <= 1:
+        return run_sync(call_agent_async(system_prompt, buffer))
+
+    futures.extend(submit(call_agent_async(chunk_prompt, chunk)) for chunk in chunks)
+    partials = [future.result() for future in futures]
+    return run_sync(reduce_summaries_async(partials, system_prompt, fan_in))
+
+
+def summary_version(system_prompt: str = prompt,
+                    chunk_tokens: int = CHUNK_TOKENS, fan_in: int = FAN_IN) -> str:
+    """
+    Return a fingerprint of everything that shapes a summary (model, prompts
+    and chunking settings), used to key cached summaries.
+    """
+    parts = (MODEL, system_prompt, chunk_prompt, reduce_prompt, chunk_tokens, fan_in)
+    return hashlib.sha256("\x00".join(map(str, parts)).encode("utf-8")).hexdigest()
+
+
+def summarize(text: str, system_prompt: str = prompt,
+              chunk_tokens: int = CHUNK_TOKENS, fan_in: int = FAN_IN) -> str:
+    """
+    Synchronous wrapper around `summarize_async`.
+    """
+    return run_sync(summarize_async(text, system_prompt, chunk_tokens, fan_in))
@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    import db_manager
+    import wrapper
+    from data_quality import DataQualityProcessor
+    from result_cache import ResultCache
+
+    # Column mapping needs the embedder, the vector index and the LLM
+    monkeypatch.setattr(wrapper, "map_columns", lambda df, *args, **kwargs: {})
+    monkeypatch.setattr(wrapper, "mapping_version", lambda *args, **kwargs: ("test",))
+    monkeypatch.setattr(db_manager, "get_mongo_client", lambda uri: mongomock.MongoClient())
+
+    processor = DataQualityProcessor()
+    processor.cache = ResultCache(str(tmp_path / "cache"))
+    return processor
+
+
+def test_csv_with_date_column_end_to_end(tmp_path, processor):
+    path = tmp_path / "visits.csv"
+    path.write_text("school,visited,pupils\nA,2024-01-05,10\nB,2024-02-11,12\nC,2099-03-01,9\n")
+
+    result = processor.process(str(path), {
+        "Region": "R", "School": "S", "Ingestion_time": "2024-01-01", "Activity": "A",
+    })
+
+    assert "error" not in result
+    assert pd.api.types.is_datetime64_any_dtype(result["result_df"]["visited"])
+    visited = next(c for c in result["quality_report"]["columns"] if c["name"] == "visited")
+    assert visited["out_of_range"] == 1
+
+    record = processor.db_manager.collection.find_one({"filename": str(path).lower()})
+    stored = processor.db_manager.load_table(record["table"])
+    assert list(stored["visited"].dt.year) == [2024, 2024, 2099]
@@ -0,0 +1,125 @@
+from abc import ABC, abstractmethod
+import os
+
+from file_lock import DEFAULT_LOCK_DIR, file_lock
+
+
+class Point:
+    """
+    A stored point as returned by a backend: search hits carry a `score`,
+    scrolled points may carry their `vector`
+
+    Mirrors the attributes of Qdrant's ScoredPoint/Record, so callers can
+    treat the results of every backend alike
+    """
+    __slots__ = ("id", "score", "payload", "vector")
+
+    def __init__(self, id, payload, score=None, vector=None):
+        self.id = id
+        self.score = score
+        self.payload = payload
+        self.vector = vector
+
+    def __repr__(self):
+        return f"Point(id={self.id!r}, score={self.score!r}, payload={self.payload!r})"
+
+
+class AbstractVectorBackend(ABC):
+    """
+    Vector index used by `Storage`: points with a string id, a vector and a
+    JSON payload, searched by cosine similarity
+    """
+    @abstractmethod
+    def upsert(self, ids, vectors, payloads):
+        """
+        Inserts or replaces points
+
+        Args:
+            ids (list[str]): Point ids
+            vectors (np.ndarray): A 2D array with one vector per point
+            payloads (list[dict]): One payload per point
+        """
+        pass
+
+    @abstractmethod
+    def search_batch(self, query_vectors, limit):
+        """
+        Finds the nearest points of many query vectors
+
+        Args:
+            query_vectors (np.ndarray): A 2D array with one query per row
+            limit (int): The maximum number of hits per query
+
+        Returns:
+            list[list]: The hits of each query (with id, score and payload),
+                        best first, in query order
+        """
+        pass
+
+    def search(self, query_vector, limit):
+        """
+        Finds the nearest points of one query vector
+        """
+        return self.search_batch([query_vector], limit)[0]
+
+    def upload(self, ids, vectors, payloads, batch_size=256, parallel=1, wait=False):
+        """
+        Bulk-loads points; all of them are visible to searches on return
+
+        The default upserts batch by batch. Backends with a faster bulk path
+        override it
+
+        Args:
+            ids (list[str]): Point ids
+            vectors (np.ndarray): A contiguous 2D float32 array, one row per point
+            payloads (list[dict]): One payload per point
+            batch_size (int, optional): Points per request
+            parallel (int, optional): Concurrent uploaders, where supported
+            wait (bool, optional): Whether every batch waits until it is applied,
+                                   rather than only the final barrier
+        """
+        for i in range(0, len(ids), batch_size):
+            self.upsert(ids[i : i + batch_size], vectors[i : i + batch_size], payloads[i : i + batch_size])
+
+    def lock(self):
+        """
+        Returns the lock serializing catalog changes to this collection
+        across the threads and processes of the host, used as a context
+        manager
+
+        The default is a lock file per collection name in DEFAULT_LOCK_DIR.
+        Backends with a directory of their own keep it there
+        """
+        return file_lock(os.path.join(DEFAULT_LOCK_DIR, f"{self.collection_name}.lock"))
+
+    @abstractmethod
+    def scroll(self, min_seq=None, with_vectors=False, page_size=1000, fields=None):
+        """
+        Lazily iterates over stored points
+
+        Args:
+            min_seq (int, optional): Only points whose "seq" payload is greater
+            with_vectors (bool, optional): Whether to return the vectors too
+            page_size (int, optional): Points fetched per request
+            fields (list[str], optional): Payload fields to return. Defaults to all
+
+        Yields:
+            Points with id, payload and (optionally) vector
+        """
+        pass
+
+    @abstractmethod
+    def count(self):
+        """
+        Returns:
+            int: The number of stored points
+        """
+        pass
+
+    @abstractmethod
+    def info(self):
+        """
+        Returns:
+            Backend-specific description of the collection
+        """
+        pass
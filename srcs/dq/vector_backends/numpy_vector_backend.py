@@ -0,0 +1,232 @@
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+from file_lock import file_lock
+from vector_backends.abstract_vector_backend import AbstractVectorBackend, Point
+
+# Where in-process indexes are persisted, one directory per collection
+DEFAULT_VECTOR_DIR = os.getenv(
+    "DQ_VECTOR_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "dq", "vectors"),
+)
+# Rows allocated for a new index; capacity doubles when it is full
+INITIAL_CAPACITY = 1024
+
+
+def normalize_rows(vectors, dim):
+    """
+    Returns the vectors as a C-contiguous float32 matrix of unit rows, so
+    cosine similarity is a plain dot product
+    """
+    matrix = np.array(vectors, dtype=np.float32, copy=True, order="C").reshape(-1, dim)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.maximum(norms, np.finfo(np.float32).tiny, out=norms)
+    matrix /= norms
+    return matrix
+
+
+class NumpyVectorBackend(AbstractVectorBackend):
+    """
+    In-process index: a normalized float32 matrix searched with one matrix
+    multiply per query batch, instead of a request per lookup
+
+    Vectors live in a memory-mapped file (vectors.f32) and ids and payloads
+    in points.json next to it, which is replaced atomically after every
+    upsert. Readers reload when points.json changes, so processes sharing
+    the directory see each other's points. Writers hold the lock file of
+    the directory, so concurrent upserts from several processes do not
+    overwrite each other's points
+    """
+    def __init__(self, name, embedding_size, root=DEFAULT_VECTOR_DIR):
+        """
+        Opens the index of a collection, creating it if it doesn't exist
+
+        Args:
+            name (str): The name of the collection
+            embedding_size (int): The dimensionality of the vectors
+            root (str, optional): Directory holding the indexes
+        """
+        self.collection_name = name
+        self.dim = embedding_size
+        self.path = os.path.join(root, name)
+        os.makedirs(self.path, exist_ok=True)
+        self._vectors_path = os.path.join(self.path, "vectors.f32")
+        self._points_path = os.path.join(self.path, "points.json")
+
+        self._lock = threading.RLock()
+        self._file_lock = file_lock(os.path.join(self.path, "lock"))
+        self._matrix = None
+        self._count = 0
+        self._ids = []
+        self._payloads = []
+        self._rows = {}
+        self._points_stamp = None
+
+        with self._lock:
+            self._load()
+
+    def _stamp(self):
+        try:
+            stat = os.stat(self._points_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _load(self):
+        # Caller holds self._lock
+        stamp = self._stamp()
+        points = {"dim": self.dim, "ids": [], "payloads": []}
+        if stamp is not None:
+            with open(self._points_path, "r", encoding="utf-8") as f:
+                points = json.load(f)
+        if points["dim"] != self.dim:
+            raise ValueError(
+                f"Index {self.path} holds {points['dim']}-d vectors, not {self.dim}-d"
+            )
+
+        self._ids = points["ids"]
+        self._payloads = points["payloads"]
+        self._count = len(self._ids)
+        self._rows = {point_id: row for row, point_id in enumerate(self._ids)}
+        self._open_matrix()
+        self._points_stamp = stamp
+
+    def _open_matrix(self):
+        # Caller holds self._lock
+        try:
+            capacity = os.path.getsize(self._vectors_path) // (4 * self.dim)
+        except FileNotFoundError:
+            capacity = 0
+        self._matrix = None
+        if capacity:
+            self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r+",
+                                     shape=(capacity, self.dim))
+
+    def _refresh(self):
+        # Caller holds self._lock; picks up points written by other processes
+        if self._stamp() != self._points_stamp:
+            self._load()
+
+    def _ensure_capacity(self, rows):
+        # Caller holds self._lock
+        capacity = 0 if self._matrix is None else self._matrix.shape[0]
+        if rows <= capacity:
+            return
+        new_capacity = max(INITIAL_CAPACITY, capacity)
+        while new_capacity < rows:
+            new_capacity *= 2
+        if self._matrix is not None:
+            self._matrix.flush()
+        # Growing the file keeps existing rows in place; new rows read as zeros
+        with open(self._vectors_path, "ab") as f:
+            f.truncate(new_capacity * self.dim * 4)
+        self._open_matrix()
+
+    def _write_points(self):
+        # Caller holds self._lock; vectors are flushed before the ids that
+        # make them visible, and the ids are replaced atomically
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "ids": self._ids, "payloads": self._payloads}, f)
+        os.replace(tmp_path, self._points_path)
+        self._points_stamp = self._stamp()
+
+    def lock(self):
+        return self._file_lock
+
+    def upsert(self, ids, vectors, payloads):
+        vectors = normalize_rows(vectors, self.dim)
+        # The file lock is taken first, as by Storage, which may already hold
+        # it; points.json is reloaded under it before being extended
+        with self._file_lock, self._lock:
+            self._refresh()
+            rows = []
+            for point_id, payload in zip(ids, payloads):
+                row = self._rows.get(point_id)
+                if row is None:
+                    row = len(self._ids)
+                    self._rows[point_id] = row
+                    self._ids.append(point_id)
+                    self._payloads.append(payload)
+                else:
+                    self._payloads[row] = payload
+                rows.append(row)
+
+            self._ensure_capacity(len(self._ids))
+            self._matrix[rows] = vectors
+            self._matrix.flush()
+            self._count = len(self._ids)
+            self._write_points()
+
+    def upload(self, ids, vectors, payloads, batch_size=256, parallel=1, wait=False):
+        # The index is in-process: one upsert writes the whole array and
+        # rewrites points.json once, instead of once per batch
+        if len(ids):
+            self.upsert(ids, vectors, payloads)
+
+    def search_batch(self, query_vectors, limit):
+        if len(query_vectors) == 0:
+            return []
+        queries = normalize_rows(query_vectors, self.dim)
+
+        with self._lock:
+            self._refresh()
+            count = self._count
+            if count == 0:
+                return [[] for _ in range(len(queries))]
+            matrix = self._matrix[:count]
+            ids = self._ids
+            payloads = self._payloads
+
+        # One matrix multiply scores every query against every point
+        scores = queries @ matrix.T
+        k = min(limit, count)
+        if k < count:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(count), scores.shape)
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        return [
+            [Point(ids[row], payloads[row], score=float(score)) for row, score in zip(rows, row_scores)]
+            for rows, row_scores in zip(top.tolist(), top_scores.tolist())
+        ]
+
+    def scroll(self, min_seq=None, with_vectors=False, page_size=1000, fields=None):
+        with self._lock:
+            self._refresh()
+            count = self._count
+            matrix = self._matrix
+            ids = self._ids
+            payloads = self._payloads
+
+        for row in range(count):
+            payload = payloads[row]
+            if min_seq is not None and (payload.get("seq") or 0) <= min_seq:
+                continue
+            if fields is not None:
+                payload = {key: payload[key] for key in fields if key in payload}
+            vector = np.array(matrix[row]) if with_vectors else None
+            yield Point(ids[row], payload, vector=vector)
+
+    def count(self):
+        with self._lock:
+            self._refresh()
+            return self._count
+
+    def info(self):
+        with self._lock:
+            self._refresh()
+            return {
+                "backend": "numpy",
+                "path": self.path,
+                "points_count": self._count,
+                "dim": self.dim,
+                "capacity": 0 if self._matrix is None else self._matrix.shape[0],
+            }
@@ -0,0 +1,145 @@
+import os
+
+from qdrant_client.models import (
+    VectorParams, Distance, PointStruct, SearchRequest,
+    Filter, FieldCondition, Range, PayloadSchemaType,
+)
+from resources import get_qdrant_client
+from vector_backends.abstract_vector_backend import AbstractVectorBackend
+
+# Talk to the server over gRPC (port 6334) instead of REST
+PREFER_GRPC = os.getenv("DQ_QDRANT_GRPC", "0") == "1"
+
+
+class QdrantVectorBackend(AbstractVectorBackend):
+    """
+    Stores points in a Qdrant collection; every lookup is a request to the
+    Qdrant server
+    """
+    def __init__(self, name, embedding_size, client=None, prefer_grpc=PREFER_GRPC):
+        """
+        Ensures the collection exists, creating it with cosine distance and an
+        integer index on the "seq" payload if it doesn't
+
+        Args:
+            name (str): The name of the collection
+            embedding_size (int): The dimensionality of the vectors
+            client (QdrantClient, optional): Client to use. Defaults to the
+                                             process-wide client of localhost:6333
+            prefer_grpc (bool, optional): Whether the default client uses gRPC.
+                                          Defaults to PREFER_GRPC
+        """
+        self.client = client or get_qdrant_client(
+            host="localhost", port=6333, timeout=60.0, prefer_grpc=prefer_grpc
+        )
+        self.collection_name = name
+
+        if not self.client.collection_exists(self.collection_name):
+            self.client.create_collection(
+                collection_name=self.collection_name,
+                vectors_config=VectorParams(size=embedding_size, distance=Distance.COSINE),
+            )
+
+        # Index the version field so incremental refreshes are range lookups
+        self.client.create_payload_index(
+            collection_name=self.collection_name,
+            field_name="seq",
+            field_schema=PayloadSchemaType.INTEGER,
+        )
+
+    def upsert(self, ids, vectors, payloads):
+        self.client.upsert(
+            collection_name=self.collection_name,
+            points=[
+                PointStruct(id=point_id, vector=vector.tolist(), payload=payload)
+                for point_id, vector, payload in zip(ids, vectors, payloads)
+            ],
+            wait=True
+        )
+
+    def upload(self, ids, vectors, payloads, batch_size=256, parallel=1, wait=False):
+        """
+        Streams the array straight into `upload_collection`, which batches it
+        without building a PointStruct per point and, with `parallel` > 1,
+        uploads batches from several processes
+
+        With `wait` False, batches are only acknowledged as received. The
+        last point is then upserted again with wait=True as a barrier: a
+        shard applies updates from one client in order, so once it is
+        applied every batch before it is too. That only holds for a
+        single-shard collection loaded by one uploader; otherwise every
+        batch waits
+        """
+        if len(ids) == 0:
+            return
+
+        if not wait and (parallel > 1 or self._shard_number() > 1):
+            wait = True
+
+        self.client.upload_collection(
+            collection_name=self.collection_name,
+            vectors=vectors,
+            payload=payloads,
+            ids=ids,
+            batch_size=batch_size,
+            parallel=parallel,
+            wait=wait,
+        )
+
+        if not wait:
+            self.client.upsert(
+                collection_name=self.collection_name,
+                points=[PointStruct(id=ids[-1], vector=vectors[-1].tolist(), payload=payloads[-1])],
+                wait=True
+            )
+
+    def _shard_number(self):
+        # Local mode reports no shard number; it has a single shard
+        return self.info().config.params.shard_number or 1
+
+    def search_batch(self, query_vectors, limit):
+        if len(query_vectors) == 0:
+            return []
+
+        return self.client.search_batch(
+            collection_name=self.collection_name,
+            requests=[
+                SearchRequest(vector=vector.tolist(), limit=limit, with_payload=True)
+                for vector in query_vectors
+            ]
+        )
+
+    def search(self, query_vector, limit):
+        return self.client.search(
+            collection_name=self.collection_name,
+            query_vector=query_vector.tolist(),
+            limit=limit
+        )
+
+    def scroll(self, min_seq=None, with_vectors=False, page_size=1000, fields=None):
+        scroll_filter = None
+        if min_seq is not None:
+            scroll_filter = Filter(must=[FieldCondition(key="seq", range=Range(gt=min_seq))])
+
+        offset = None
+        while True:
+            points, next_page_offset = self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=scroll_filter,
+                limit=page_size,
+                with_payload=fields or True,
+                with_vectors=with_vectors,
+                offset=offset
+            )
+            yield from points
+
+            if next_page_offset is None:
+                break
+
+            offset = next_page_offset
+
+    def count(self):
+        return self.client.count(collection_name=self.collection_name, exact=True).count
+
+    def info(self):
+        return self.client.get_collection(collection_name=self.collection_name)
@@ -1,22 +1,87 @@
 import pandas as pd
 import pprint
 
-from embedding import Embedding
-from storage import Storage
+from column_profile import profile_column, value_signatures
+from embedding import MODEL_NAME
+from resources import get_embedder, get_storage
 
-def process_df(df):
-    embedder = Embedding()
-    storage = Storage(name="tmp-tmp-name", embedding_size=384)
+# Qdrant collection holding the known features
+COLLECTION_NAME = "tmp-tmp-name"
+EMBEDDING_SIZE = 384
+
+
+def mapping_version(candidate_k=None, candidate_floor=0.0):
+    """
+    Return what a `map_columns` result depends on besides the table and the
+    catalog: the model, the collection and the matching settings. Cached
+    mappings are keyed by it; whether their features are still in the
+    catalog is checked with `catalog_has` when they are reused.
+    """
+    import storage
+
+    return (
+        MODEL_NAME, COLLECTION_NAME,
+        candidate_k, candidate_floor, storage.NAME_WEIGHT, storage.ACCEPT_SCORE,
+        storage.ACCEPT_MARGIN, storage.NEW_BELOW_SCORE,
+    )
+
+
+def catalog_has(features):
+    """
+    Return whether every name in `features` is a feature of the catalog.
+    """
+    features = set(features)
+    if not features:
+        return True
+    catalog = get_storage(name=COLLECTION_NAME, embedding_size=EMBEDDING_SIZE)
+    return features <= set(catalog.list_data())
+
+
+def map_columns(df, candidate_k=None, candidate_floor=0.0, skipped=None):
+    """
+    Resolve every column of `df` against the feature catalog and return
+    a {column: known_feature_name} map of the columns to rename.
+
+    A column is not renamed to a feature name that another column of `df`
+    already has or is renamed to, so column names stay unique; such
+    renames are appended to `skipped`, if given, as {"column", "feature"}.
+    """
+    embedder = get_embedder()
+    storage = get_storage(name=COLLECTION_NAME, embedding_size=EMBEDDING_SIZE)
 
     rename_map = {}
 
-    for col in df.columns:
-        embedded_col = embedder.embed_text(col)[0]
-        res_flag, new_name = storage.smart_load(embedded_col, col, df[col].tolist())
-        
-        if not res_flag and col != new_name:
-            rename_map[col] = new_name
-    
+    # Embed all column names in one forward pass and resolve them in one batch
+    columns = list(df.columns)
+    texts = [str(col) for col in columns]
+    embedded_cols = embedder.embed_text(*texts)
+    # The LLM sees a bounded column signature instead of every value, and
+    # the same profiles give the value signatures matched next to the names
+    profiles = [profile_column(df.iloc[:, i]) for i in range(len(columns))]
+    results = storage.smart_load_batch(
+        embedded_cols, texts, profiles,
+        candidate_k=candidate_k, candidate_floor=candidate_floor,
+        # Only built for the columns the names alone leave unresolved
+        value_vectors=lambda indices: value_signatures([profiles[i] for i in indices], embedder.embed_text),
+    )
+
+    taken = set(texts)
+    for col, text, (res_flag, new_name) in zip(columns, texts, results):
+        if res_flag or text == new_name:
+            continue
+        if new_name in taken:
+            if skipped is not None:
+                skipped.append({"column": text, "feature": new_name})
+            continue
+        rename_map[col] = new_name
+        taken.add(new_name)
+
+    return rename_map
+
+
+def process_df(df, candidate_k=None, candidate_floor=0.0):
+    rename_map = map_columns(df, candidate_k, candidate_floor)
+
     if rename_map:
         df = df.rename(columns=rename_map)
 